@@ -1,17 +1,38 @@
-from flask import Flask
-
-from app.api.health import health_bp
-from app.api.webhooks import webhook_bp
 from app.config import Config
+from app.utils.log import configure_logging
+from app.utils.report_links import check_link_config
 
 
 def create_app():
     """Factory function para criar a aplicação Flask"""
+    # Flask e blueprints importados aqui: o worker importa o pacote `app`
+    # (app.tasks, app.models...) e não precisa carregar a camada web
+    from flask import Flask
+
+    from app.api.exports import export_bp
+    from app.api.health import health_bp
+    from app.api.previews import previews_bp
+    from app.api.reports import reports_bp
+    from app.api.responses import responses_bp
+    from app.api.webhooks import webhook_bp
+
+    configure_logging()
+    check_link_config()
+
     app = Flask(__name__)
     app.config.from_object(Config)
 
     # Registrar blueprints
     app.register_blueprint(webhook_bp, url_prefix="/api/v1/webhooks")
     app.register_blueprint(health_bp, url_prefix="/api/v1/health")
+    app.register_blueprint(export_bp, url_prefix="/api/v1/exports")
+    app.register_blueprint(reports_bp, url_prefix="/api/v1/reports")
+    app.register_blueprint(responses_bp, url_prefix="/api/v1/responses")
+    app.register_blueprint(previews_bp, url_prefix="/api/v1/previews")
+
+    if Config.TASK_EXECUTOR == "local":
+        from app.utils.local_executor import start
+
+        start()
 
     return app
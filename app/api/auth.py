@@ -0,0 +1,29 @@
+import hmac
+from functools import wraps
+
+from flask import jsonify, request
+
+from app.config import Config
+
+
+def require_admin_token(view):
+    """
+    Protege endpoints administrativos com o token ADMIN_API_TOKEN.
+
+    O token deve vir no header `Authorization: Bearer <token>`. Se o token
+    não estiver configurado, os endpoints ficam desabilitados.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not Config.ADMIN_API_TOKEN:
+            return jsonify({"error": "Endpoint administrativo desabilitado"}), 403
+
+        auth_header = request.headers.get("Authorization", "")
+        token = auth_header.removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(token, Config.ADMIN_API_TOKEN):
+            return jsonify({"error": "Não autorizado"}), 401
+
+        return view(*args, **kwargs)
+
+    return wrapper
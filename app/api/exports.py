@@ -0,0 +1,101 @@
+import re
+from datetime import datetime, timezone
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+
+from app.api.auth import require_admin_token
+from app.utils.export import (
+    EXPORT_FORMATS,
+    ExportFilters,
+    iter_response_chunks,
+    require_pyarrow,
+    stream_csv,
+    stream_parquet,
+)
+
+export_bp = Blueprint("exports", __name__)
+
+
+@export_bp.route("/responses", methods=["GET"])
+@require_admin_token
+def export_responses():
+    """
+    Exporta FormResponse (scores e flags de status) em CSV ou Parquet.
+
+    Query params:
+        format: csv (padrão) ou parquet
+        from / to: intervalo de created_at (ISO 8601, `to` exclusivo)
+        processed / email_sent: true ou false
+        form_id: formulário/coorte
+    """
+    output_format = request.args.get("format", "csv").lower()
+    if output_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Formato inválido: {output_format}"}), 400
+
+    try:
+        filters = ExportFilters.from_params(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if output_format == "parquet":
+        try:
+            require_pyarrow()
+        except RuntimeError as e:
+            return jsonify({"error": str(e)}), 501
+
+    chunks = iter_response_chunks(filters)
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    filename = f"form_responses_{timestamp}.{output_format}"
+
+    if output_format == "parquet":
+        body = stream_parquet(chunks)
+        mimetype = "application/vnd.apache.parquet"
+    else:
+        body = stream_csv(chunks)
+        mimetype = "text/csv"
+
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@export_bp.route("/reports.zip", methods=["GET"])
+@require_admin_token
+def export_reports_zip():
+    """
+    ZIP com o relatório PDF de cada FormResponse que passa nos filtros.
+
+    Os relatórios são renderizados em paralelo, no pool de renderização do
+    processo (EXPORT_RENDER_WORKERS, compartilhado entre downloads), e entram
+    no ZIP conforme ficam prontos; a resposta é enviada em streaming, sem
+    montar o arquivo inteiro.
+
+    Query params:
+        form_id: formulário/coorte
+        from / to: intervalo de created_at (ISO 8601, `to` exclusivo)
+        processed / email_sent: true ou false
+    """
+    try:
+        filters = ExportFilters.from_params(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Importado aqui: o processo web só carrega PyMuPDF se houver download
+    from app.utils.batch_render import (
+        iter_render_jobs,
+        iter_shared_rendered_reports,
+        stream_zip,
+    )
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    cohort = re.sub(r"[^A-Za-z0-9_-]", "_", filters.form_id or "todos")
+    filename = f"relatorios_{cohort}_{timestamp}.zip"
+    body = stream_zip(iter_shared_rendered_reports(iter_render_jobs(filters)))
+
+    return Response(
+        stream_with_context(body),
+        mimetype="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
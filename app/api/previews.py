@@ -0,0 +1,86 @@
+import time
+
+from flask import Blueprint, Response, jsonify, request
+from sqlalchemy.orm import defer
+from sqlmodel import Session, select
+
+from app.api.auth import require_admin_token
+from app.models.form_response import FormResponse
+from app.utils.database import engine
+from app.utils.preview import render_preview, response_from_scores
+
+previews_bp = Blueprint("previews", __name__)
+
+_MIMETYPES = {"pdf": "application/pdf", "png": "image/png"}
+
+
+def _serve_preview(response: FormResponse):
+    """
+    Query params:
+        format: png (padrão) ou pdf
+        page: página do PNG (padrão: 1)
+        dpi: resolução do PNG (36 a 200, padrão: 72)
+    """
+    output_format = request.args.get("format", "png").lower()
+    page = request.args.get("page", "1")
+    if not page.isdecimal():
+        return jsonify({"error": f"Página inválida: {page}"}), 400
+    dpi = request.args.get("dpi", "72")
+    if not dpi.isdecimal():
+        return jsonify({"error": f"DPI inválido: {dpi}"}), 400
+
+    try:
+        start = time.perf_counter()
+        content, key, hit = render_preview(response, output_format, int(page), int(dpi))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    etag = f'"{key}"'
+    if etag in request.headers.get("If-None-Match", ""):
+        result = Response(status=304)
+    else:
+        result = Response(content, mimetype=_MIMETYPES[output_format])
+    result.headers["ETag"] = etag
+    result.headers["Cache-Control"] = "private, no-cache"
+    result.headers["X-Preview-Cache"] = "hit" if hit else "miss"
+    result.headers["Server-Timing"] = f"render;dur={elapsed_ms:.1f}"
+    return result
+
+
+@previews_bp.route("/<int:response_id>", methods=["GET"])
+@require_admin_token
+def preview_response(response_id: int):
+    """Preview do relatório de uma resposta já pontuada."""
+    with Session(engine) as session:
+        statement = (
+            select(FormResponse)
+            .where(FormResponse.id == response_id)
+            .options(defer(FormResponse.raw_payload))  # type: ignore
+        )
+        response = session.exec(statement).first()
+
+    if response is None:
+        return jsonify({"error": "Response não encontrado"}), 404
+    return _serve_preview(response)
+
+
+@previews_bp.route("", methods=["POST"])
+@require_admin_token
+def preview_scores():
+    """
+    Preview do relatório para scores arbitrários (ex: ao ajustar os níveis
+    ou os textos descritivos).
+
+    Body JSON: {"scores": {"agilidade": 7.5, ...}, "name": ..., "email": ...,
+    "form_id": ...}
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Body JSON inválido"}), 400
+
+    try:
+        response = response_from_scores(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return _serve_preview(response)
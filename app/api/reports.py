@@ -0,0 +1,41 @@
+import os
+
+from flask import Blueprint, jsonify, send_file
+from itsdangerous import BadSignature, SignatureExpired
+
+from app.utils.report_links import resolve_download_token, stored_report_path
+
+reports_bp = Blueprint("reports", __name__)
+
+
+@reports_bp.route("/<token>", methods=["GET"])
+def download_report(token: str):
+    """
+    Serve o relatório a partir de um link assinado e com expiração.
+
+    send_file cuida de GET condicional (ETag / Last-Modified), requisições
+    Range e do envio eficiente do arquivo (wsgi.file_wrapper / sendfile).
+    """
+    try:
+        response_id = resolve_download_token(token)
+    except SignatureExpired:
+        return jsonify({"error": "Link expirado"}), 410
+    except BadSignature:
+        return jsonify({"error": "Link inválido"}), 404
+
+    path = stored_report_path(response_id)
+    if not os.path.exists(path):
+        return jsonify({"error": "Relatório não encontrado"}), 404
+
+    response = send_file(
+        path,
+        mimetype="application/pdf",
+        download_name="relatorio_estilos_de_trabalho.pdf",
+        conditional=True,
+        etag=True,
+        max_age=3600,
+    )
+    # O link é pessoal: não deve ficar em caches compartilhados
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
@@ -0,0 +1,100 @@
+import json
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from redis import RedisError
+from sqlmodel import Session, select
+
+from app.models.form_response import FormResponse
+from app.utils.database import engine
+from app.utils.status import (
+    TERMINAL_STAGES,
+    cache_status,
+    get_cached_status,
+    iter_status_updates,
+    stage_from_flags,
+)
+
+responses_bp = Blueprint("responses", __name__)
+
+MAX_WAIT_SECONDS = 30
+MAX_STREAM_SECONDS = 300
+
+
+def _current_status(response_id: int):
+    """Status do Redis; só consulta o Postgres quando o cache não existe."""
+    status = get_cached_status(response_id)
+    if status is not None:
+        return status
+
+    with Session(engine) as session:
+        statement = select(
+            FormResponse.processed,
+            FormResponse.pdf_generated,
+            FormResponse.email_sent,
+            FormResponse.error_message,
+        ).where(FormResponse.id == response_id)
+        row = session.exec(statement).first()
+
+    if row is None:
+        return None
+    return cache_status(response_id, stage_from_flags(*row))
+
+
+def _sse(status) -> str:
+    return f"event: status\ndata: {json.dumps(status)}\n\n"
+
+
+@responses_bp.route("/<int:response_id>/status", methods=["GET"])
+def response_status(response_id: int):
+    """
+    Etapa atual do processamento de uma submissão.
+
+    Query params:
+        wait: long-poll; segura a resposta por até `wait` segundos (máx. 30)
+            até a etapa mudar em relação a `since`
+        since: etapa que o cliente já conhece (usada com `wait`)
+        stream=1 (ou Accept: text/event-stream): Server-Sent Events até a
+            etapa final
+    """
+    try:
+        status = _current_status(response_id)
+    except RedisError:
+        return jsonify({"error": "Status indisponível"}), 503
+
+    if status is None:
+        return jsonify({"error": "Resposta não encontrada"}), 404
+
+    wants_stream = request.args.get("stream") == "1" or (
+        request.accept_mimetypes.best == "text/event-stream"
+    )
+    if wants_stream:
+
+        def events():
+            yield _sse(status)
+            if status["stage"] in TERMINAL_STAGES:
+                return
+            last_stage = status["stage"]
+            for update in iter_status_updates(response_id, MAX_STREAM_SECONDS):
+                if update is None:
+                    yield ": keep-alive\n\n"
+                elif update["stage"] != last_stage:
+                    last_stage = update["stage"]
+                    yield _sse(update)
+                    if last_stage in TERMINAL_STAGES:
+                        return
+
+        return Response(
+            stream_with_context(events()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    wait = min(request.args.get("wait", 0, type=float), MAX_WAIT_SECONDS)
+    since = request.args.get("since", status["stage"])
+    if wait > 0 and status["stage"] == since and since not in TERMINAL_STAGES:
+        for update in iter_status_updates(response_id, wait):
+            if update is not None and update["stage"] != since:
+                status = update
+                break
+
+    return jsonify(status), 200
@@ -1,15 +1,29 @@
-import json
+import logging
 from datetime import datetime
 
 from flask import Blueprint, jsonify, request
 from sqlmodel import Session, select
+from werkzeug.exceptions import RequestEntityTooLarge
 
 from app.models.form_response import FormResponse
-from app.tasks import process_form_response
 from app.utils.database import engine
+from app.utils.ingest import (
+    InvalidSubmission,
+    accepted_body,
+    apply_resubmission,
+    coalesce_countdown,
+    new_response,
+    parse_submission,
+    too_large_body,
+)
+from app.utils.log import bound_response_id
+from app.utils.outbox import stage_form_response
+from app.utils.status import publish_status
 
 webhook_bp = Blueprint("webhooks", __name__)
 
+logger = logging.getLogger(__name__)
+
 
 @webhook_bp.route("/tally", methods=["POST"])
 def handle_tally_webhook():
@@ -17,38 +31,28 @@ def handle_tally_webhook():
     Endpoint para receber webhooks do Tally.so
 
     Fluxo:
-    1. Recebe payload do Tally
-    2. Extrai email e nome
-    3. Faz upsert no banco (se email já existe, atualiza)
-    4. Dispara task assíncrona do Celery
+    1. Recebe payload do Tally (até MAX_CONTENT_LENGTH bytes)
+    2. Valida o payload (TallyWebhook) e extrai email, nome e atributos
+    3. Faz upsert no banco (se email já existe, atualiza e avança a geração)
+    4. Grava a task no outbox, na mesma transação (o outbox_relay.py publica
+       no Celery; reenvios esperam a janela RESUBMISSION_COALESCE_SECONDS)
     5. Retorna 202 (Accepted) imediatamente
-    """
-
-    try:
-        payload = request.get_json()
-
-        if not payload:
-            return jsonify({"error": "Payload vazio"}), 400
 
-        # Extrair dados básicos do payload
-        data = payload.get("data", {})
-        fields = data.get("fields", [])
+    A versão ASGI (app.asgi) segue o mesmo contrato.
+    """
 
-        # Buscar nome e email
-        name = ""
-        email = ""
-        for field in fields:
-            label = field.get("label", "").lower()
-            if "nome" in label:
-                name = field.get("value", "")
-            elif "e-mail" in label or "email" in label:
-                email = field.get("value", "")
+    received_at = datetime.utcnow()
 
-        if not email:
-            return jsonify({"error": "Email não encontrado no payload"}), 400
+    try:
+        try:
+            body = request.get_data(cache=False)
+        except RequestEntityTooLarge:
+            return jsonify(too_large_body()), 413
 
-        if not name:
-            return jsonify({"error": "Nome não encontrado no payload"}), 400
+        try:
+            name, email, data = parse_submission(body)
+        except InvalidSubmission as e:
+            return jsonify({"error": str(e)}), 400
 
         # Salvar no banco
         with Session(engine) as session:
@@ -57,42 +61,38 @@ def handle_tally_webhook():
             existing = session.exec(statement).first()
 
             if existing:
-                # Atualizar registro existente
-                existing.name = name
-                existing.raw_payload = json.dumps(payload)
-                existing.tally_response_id = data.get("responseId", "")
-                existing.submitted_at = datetime.utcnow()
-                existing.updated_at = datetime.utcnow()
-                # Resetar flags de processamento
-                existing.processed = False
-                existing.pdf_generated = False
-                existing.email_sent = False
-                existing.error_message = None
+                apply_resubmission(existing, name, body, data, received_at)
                 response_record = existing
             else:
-                # Criar novo registro
-                response_record = FormResponse(
-                    email=email,
-                    name=name,
-                    raw_payload=json.dumps(payload),
-                    tally_response_id=data.get("responseId", ""),
-                )
+                response_record = new_response(name, email, body, data, received_at)
                 session.add(response_record)
 
-            session.commit()
+            # id e geração (incrementada no UPDATE) antes de gravar o outbox
+            session.flush()
             session.refresh(response_record)
             response_id = response_record.id
+            generation = response_record.generation
+
+            # Task no outbox, no mesmo commit: sem esperar o broker e sem
+            # perder a submissão se ele falhar. Num reenvio, a execução espera
+            # a janela: se vier outro reenvio nesse meio tempo, só o último roda
+            stage_form_response(
+                session,
+                response_id,  # type: ignore
+                generation=generation,
+                countdown=coalesce_countdown(existing is not None),
+            )
+            session.commit()
 
-        # Disparar task assíncrona do Celery
-        process_form_response.delay(response_id)  # type: ignore
+        with bound_response_id(response_id):
+            publish_status(response_id, "received")  # type: ignore
+            logger.info(
+                "Submissão enfileirada",
+                extra={"generation": generation, "resubmission": bool(existing)},
+            )
 
-        return jsonify(
-            {
-                "status": "success",
-                "message": "Webhook recebido e processamento iniciado",
-                "response_id": response_id,
-            }
-        ), 202
+        return jsonify(accepted_body(response_id)), 202  # type: ignore
 
     except Exception as e:
+        logger.exception("Falha ao processar webhook do Tally")
         return jsonify({"error": str(e)}), 500
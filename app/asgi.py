@@ -0,0 +1,274 @@
+"""
+Servidor ASGI de ingestão: webhook do Tally e health checks.
+
+Alternativa ao Flask para o caminho quente. Cada requisição espera o banco
+de forma assíncrona (asyncpg), então um único processo segura milhares de
+entregas simultâneas, limitadas pelo pool de conexões e não por threads.
+O contrato de /api/v1/webhooks/tally é o mesmo de app.api.webhooks.
+
+Requer o extra "asgi" (uvicorn, asyncpg, aiosqlite):
+    pip install '.[asgi]'    # ou: uv sync --extra asgi
+    uvicorn app.asgi:app --host 0.0.0.0 --port 8000
+
+No Docker: serviço `ingest` (docker compose --profile asgi up -d ingest).
+"""
+
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import select, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config import Config
+from app.models.form_response import FormResponse
+from app.utils.database import set_sqlite_pragmas
+from app.utils.ingest import (
+    InvalidSubmission,
+    accepted_body,
+    apply_resubmission,
+    coalesce_countdown,
+    new_response,
+    parse_submission,
+    too_large_body,
+)
+from app.utils.log import bound_response_id, configure_logging
+from app.utils.outbox import NOTIFY_STATEMENT, form_response_entry
+from app.utils.status import apublish_status
+
+logger = logging.getLogger(__name__)
+
+# Drivers assíncronos equivalentes aos da DATABASE_URL
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+
+_engine: Optional[AsyncEngine] = None
+
+
+def async_database_url(url: str) -> str:
+    """Troca o driver da DATABASE_URL pelo equivalente assíncrono."""
+    scheme, _, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+def get_engine() -> AsyncEngine:
+    """
+    Engine assíncrona, criada no primeiro uso.
+
+    Requer asyncpg (Postgres) ou aiosqlite (SQLite), dependências opcionais.
+    """
+    global _engine
+    if _engine is None:
+        driver = "aiosqlite" if Config.DATABASE_URL.startswith("sqlite") else "asyncpg"
+        try:
+            __import__(driver)
+        except ImportError:
+            raise RuntimeError(
+                f"Servidor ASGI requer {driver} (pip install '.[asgi]')"
+            ) from None
+
+        options: dict[str, Any] = {}
+        if not Config.DATABASE_URL.startswith("sqlite"):
+            options = {
+                "pool_size": Config.ASGI_DB_POOL_SIZE,
+                "max_overflow": Config.ASGI_DB_MAX_OVERFLOW,
+                "pool_timeout": 30,
+            }
+        _engine = create_async_engine(
+            async_database_url(Config.DATABASE_URL), **options
+        )
+        if _engine.dialect.name == "sqlite":
+            # Mesmos pragmas da engine síncrona (WAL, busy_timeout): sem eles,
+            # escritas concorrentes com o worker falham com "database is locked"
+            event.listen(_engine.sync_engine, "connect", set_sqlite_pragmas)
+    return _engine
+
+
+async def handle_tally_webhook(body: bytes) -> tuple[int, dict[str, Any]]:
+    """Mesmo fluxo e respostas de app.api.webhooks.handle_tally_webhook."""
+    received_at = datetime.utcnow()
+
+    try:
+        try:
+            name, email, data = parse_submission(body)
+        except InvalidSubmission as e:
+            return 400, {"error": str(e)}
+
+        engine = get_engine()
+        async with AsyncSession(engine) as session:
+            statement = select(FormResponse).where(FormResponse.email == email)
+            existing = (await session.exec(statement)).first()
+
+            if existing:
+                apply_resubmission(existing, name, body, data, received_at)
+                response_record = existing
+            else:
+                response_record = new_response(name, email, body, data, received_at)
+                session.add(response_record)
+
+            await session.flush()
+            await session.refresh(response_record)
+            response_id: int = response_record.id  # type: ignore
+            generation = response_record.generation
+
+            session.add(
+                form_response_entry(
+                    response_id,
+                    generation=generation,
+                    countdown=coalesce_countdown(existing is not None),
+                )
+            )
+            if engine.dialect.name == "postgresql":
+                await session.exec(NOTIFY_STATEMENT)  # type: ignore
+            await session.commit()
+
+        with bound_response_id(response_id):
+            await apublish_status(response_id, "received")
+            logger.info(
+                "Submissão enfileirada",
+                extra={"generation": generation, "resubmission": bool(existing)},
+            )
+
+        return 202, accepted_body(response_id)
+
+    except Exception as e:
+        logger.exception("Falha ao processar webhook do Tally")
+        return 500, {"error": str(e)}
+
+
+async def health_check() -> tuple[int, dict[str, Any]]:
+    try:
+        async with get_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+        return 200, {
+            "status": "healthy",
+            "database": "connected",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+
+    except Exception as e:
+        return 503, {
+            "status": "unhealthy",
+            "database": "disconnected",
+            "error": str(e),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+
+
+async def readiness_check() -> tuple[int, dict[str, Any]]:
+    return 200, {
+        "status": "ready",
+        "message": "Application is ready to receive requests",
+    }
+
+
+class RejectedBody(Exception):
+    """Corpo da requisição recusado, com o status e o corpo da resposta."""
+
+    def __init__(self, status: int, body: dict[str, Any]) -> None:
+        super().__init__(body)
+        self.status = status
+        self.body = body
+
+
+async def _read_body(scope: Scope, receive: Receive) -> bytes:
+    """
+    Corpo da requisição.
+
+    Raises:
+        RejectedBody: Content-Length inválido (400) ou corpo acima de
+            MAX_CONTENT_LENGTH (413)
+    """
+    limit = Config.MAX_CONTENT_LENGTH
+    for name, value in scope["headers"]:
+        if name != b"content-length":
+            continue
+        try:
+            length = int(value)
+        except ValueError:
+            raise RejectedBody(400, {"error": "Content-Length inválido"}) from None
+        if length > limit:
+            raise RejectedBody(413, too_large_body())
+
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            raise RejectedBody(413, too_large_body())
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _send_json(send: Send, status: int, body: dict[str, Any]) -> None:
+    # Mesma serialização do jsonify do Flask (compacta, chaves ordenadas)
+    data = (json.dumps(body, separators=(",", ":"), sort_keys=True) + "\n").encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(data)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": data})
+
+
+async def _lifespan(receive: Receive, send: Send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            configure_logging()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if _engine is not None:
+                await _engine.dispose()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope: Scope, receive: Receive, send: Send) -> None:
+    """Aplicação ASGI (uvicorn app.asgi:app)."""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    path = scope["path"].rstrip("/")
+    method = scope["method"]
+
+    if path == "/api/v1/webhooks/tally":
+        if method != "POST":
+            await _send_json(send, 405, {"error": "Método não permitido"})
+            return
+        try:
+            request_body = await _read_body(scope, receive)
+        except RejectedBody as e:
+            status, body = e.status, e.body
+        else:
+            status, body = await handle_tally_webhook(request_body)
+    elif path == "/api/v1/health" and method == "GET":
+        status, body = await health_check()
+    elif path == "/api/v1/health/ready" and method == "GET":
+        status, body = await readiness_check()
+    else:
+        status, body = 404, {"error": "Não encontrado"}
+
+    await _send_json(send, status, body)
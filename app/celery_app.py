@@ -1,6 +1,19 @@
+from typing import Any
+
 from celery import Celery
+from celery.signals import setup_logging
+from kombu import Queue
 
 from app.config import Config
+from app.utils.log import configure_logging
+
+# Filas de prioridade: "live" para submissões recém-chegadas, "bulk" para
+# reprocessamentos em massa (rescore, reenvio, backfill). Cada fila tem seus
+# próprios workers, então um lote grande nunca fica na frente de uma
+# submissão nova.
+LIVE_QUEUE = "live"
+BULK_QUEUE = "bulk"
+LANES = (LIVE_QUEUE, BULK_QUEUE)
 
 
 def create_celery_app():
@@ -15,6 +28,29 @@ def create_celery_app():
         result_serializer="json",
         timezone="UTC",
         enable_utc=True,
+        # Ninguém lê os retornos das tasks: o progresso é publicado em
+        # app.utils.status. Sem isso, cada execução deixava uma chave sem
+        # expiração no Redis.
+        task_ignore_result=True,
+        result_expires=3600,
+        task_queues=[Queue(LIVE_QUEUE), Queue(BULK_QUEUE)],
+        task_default_queue=LIVE_QUEUE,
+        task_routes={"render_reports_batch": {"queue": BULK_QUEUE}},
+        # Cada processo reserva só a task que está executando: tasks longas do
+        # bulk não prendem mensagens que outro worker poderia pegar
+        worker_prefetch_multiplier=1,
+        # Confirma só ao terminar; se o worker morrer, a task volta para a fila
+        task_acks_late=True,
+        task_reject_on_worker_lost=True,
+        # Recicla o processo filho (depois de terminar a task) quando o RSS
+        # passa do orçamento; ver também app.tasks.check_memory_budget
+        worker_max_memory_per_child=Config.WORKER_MAX_MEMORY_MB * 1024 or None,
+        beat_schedule={
+            "sweep-stale-responses": {
+                "task": "sweep_stale_responses",
+                "schedule": float(Config.SWEEPER_INTERVAL_SECONDS),
+            },
+        },
     )
 
     celery.autodiscover_tasks(["app.tasks"])
@@ -23,3 +59,10 @@ def create_celery_app():
 
 
 celery = create_celery_app()
+
+
+@setup_logging.connect
+def _setup_logging(**_: Any) -> None:
+    # Com um receptor conectado o Celery não configura o próprio logging: worker
+    # e beat usam o mesmo handler em fila/JSON do processo web
+    configure_logging()
@@ -1,3 +1,6 @@
+from .dead_letter import DeadLetter
 from .form_response import FormResponse
+from .form_response_payload import FormResponsePayload
+from .task_outbox import TaskOutbox
 
-__all__ = ["FormResponse"]
+__all__ = ["DeadLetter", "FormResponse", "FormResponsePayload", "TaskOutbox"]
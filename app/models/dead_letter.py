@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class DeadLetter(SQLModel, table=True):
+    """Tasks que falharam de vez (erro permanente ou tentativas esgotadas)"""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    response_id: int = Field(index=True)
+    task_name: str
+
+    # Onde e por que falhou
+    stage: str  # scoring, pdf, email
+    kind: str  # permanent ou exhausted
+    exception_type: str
+    error_message: str
+    attempts: int
+
+    # Timestamps
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    redriven_at: Optional[datetime] = Field(default=None, index=True)
@@ -1,12 +1,25 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel
 
 
 class FormResponse(SQLModel, table=True):
     """Modelo para armazenar respostas do formulário Tally"""
 
+    __table_args__ = (
+        # Paginação por keyset (exportação) sem varrer a tabela com os payloads
+        Index("ix_formresponse_created_at_id", "created_at", "id"),
+        # Varredura de submissões travadas (app.tasks.sweeper)
+        Index(
+            "ix_formresponse_pending_updated_at",
+            "updated_at",
+            postgresql_where=text("NOT processed OR NOT email_sent"),
+            sqlite_where=text("processed = 0 OR email_sent = 0"),
+        ),
+    )
+
     # Campos principais
     id: Optional[int] = Field(default=None, primary_key=True)
     email: str = Field(unique=True, index=True)  # Email único por participante
@@ -14,10 +27,16 @@ class FormResponse(SQLModel, table=True):
 
     # Metadados da submissão
     tally_response_id: str = Field(unique=True, index=True)  # ID único do Tally
+    form_id: Optional[str] = None  # formId do Tally (seleciona o template)
     submitted_at: datetime = Field(default_factory=datetime.utcnow)
 
-    # Payload completo do webhook (JSON)
-    raw_payload: str  # Armazenar como string JSON
+    # Payload completo do webhook (JSON). Depois de arquivado fica NULL e o
+    # conteúdo vai comprimido para FormResponsePayload (ver payload_store)
+    raw_payload: Optional[str] = None
+
+    # Valores dos atributos extraídos do payload no recebimento (JSON, antes
+    # da normalização do modelo): o worker pontua sem reler o payload
+    attribute_values: Optional[str] = None
 
     # Scores calculados (0-10)
     score_agilidade: Optional[float] = None
@@ -28,6 +47,7 @@ class FormResponse(SQLModel, table=True):
     score_informalidade: Optional[float] = None
     score_orientacao_resultados: Optional[float] = None
     score_trabalho_equipe: Optional[float] = None
+    scoring_model_version: Optional[str] = None  # "<modelo>@<versão>" usado
 
     # Status do processamento
     processed: bool = Field(default=False)
@@ -37,6 +57,18 @@ class FormResponse(SQLModel, table=True):
     # Controle de erros
     error_message: Optional[str] = None
 
+    # Incrementado a cada reenvio; execuções de uma geração antiga desistem
+    # antes de cada etapa (ver process_form_response)
+    generation: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+
+    # Trilha de latência por etapa (UTC); a última execução sobrescreve
+    received_at: Optional[datetime] = Field(default=None, index=True)
+    enqueued_at: Optional[datetime] = None
+    scoring_started_at: Optional[datetime] = None
+    scoring_finished_at: Optional[datetime] = None
+    pdf_finished_at: Optional[datetime] = None
+    email_accepted_at: Optional[datetime] = None
+
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
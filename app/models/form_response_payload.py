@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class FormResponsePayload(SQLModel, table=True):
+    """Payload do webhook arquivado, comprimido com zstd (um por FormResponse)"""
+
+    response_id: int = Field(foreign_key="formresponse.id", primary_key=True)
+    data: bytes
+    codec: str = "zstd"
+
+    # Tamanhos em bytes, para o relatório de espaço
+    original_size: int
+    compressed_size: int
+
+    archived_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class TaskOutbox(SQLModel, table=True):
+    """Tasks a enfileirar, gravadas na transação que as originou (outbox_relay.py)"""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    task_name: str
+    args: str  # JSON (lista)
+    kwargs: str  # JSON (objeto)
+    lane: str
+
+    # Não executar antes disso (ex: janela de coalescência de reenvios)
+    eta: Optional[datetime] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
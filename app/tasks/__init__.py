@@ -1,18 +1,165 @@
 import json
-from typing import Any
+import logging
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
 
-from sqlmodel import Session
+from celery.signals import task_postrun, task_prerun, worker_init, worker_process_init
+from sqlmodel import Session, select
 
 from app.celery_app import celery
+from app.config import Config
+from app.models.dead_letter import DeadLetter
 from app.models.form_response import FormResponse
-from app.tasks.email_sender import send_email_with_pdf
+from app.tasks.batch_render import render_reports_batch
+from app.tasks.email_sender import (
+    get_ssl_context,
+    send_email_with_link,
+    send_email_with_pdf,
+)
+from app.tasks.errors import (
+    EXHAUSTED,
+    PERMANENT,
+    TRANSIENT,
+    ResponseNotFound,
+    classify_exception,
+    format_error,
+    retry_countdown,
+)
 from app.tasks.pdf_generator import generate_pdf
-from app.tasks.score_calculator import process_webhook
+from app.tasks.score_calculator import (
+    UserResponse,
+    normalize_values,
+    process_webhook,
+    score_response,
+)
+from app.tasks.scoring_models import SCORE_COLUMNS
+from app.tasks.scoring_models import registry as scoring_models
+from app.tasks.sweeper import sweep_stale_responses
 from app.utils.database import engine
+from app.utils.log import response_id_var
+from app.utils.memory import StageTracer, current_rss_kb
+from app.utils.payload_store import load_raw_payload
+from app.utils.report_links import (
+    build_download_url,
+    check_link_config,
+    store_report,
+)
+from app.utils.status import publish_status
+from app.utils.template_registry import registry
 
+logger = logging.getLogger(__name__)
 
-@celery.task(name="process_form_response", bind=True, max_retries=3)
-def process_form_response(self: Any, response_id: int) -> dict[str, Any]:
+
+@worker_init.connect
+def check_worker_config(**_: Any) -> None:
+    """
+    Impede o worker de subir com configuração insegura. O Celery só registra
+    exceções dos handlers de sinais, então a saída é via SystemExit.
+    """
+    try:
+        check_link_config()
+    except RuntimeError as e:
+        raise SystemExit(f"[-] {e}") from None
+
+
+@worker_process_init.connect
+def preload_worker_resources(**_: Any) -> None:
+    """
+    Prepara cada processo filho do worker antes da primeira task:
+    descarta conexões herdadas do pai, carrega os templates e os modelos de
+    pontuação em memória e cria o contexto TLS do SMTP.
+    """
+    engine.dispose(close=False)
+    registry.preload()
+    scoring_models.preload()
+    get_ssl_context()
+    if Config.MEMORY_TRACE_TOP_N > 0:
+        tracemalloc.start()
+
+
+@task_prerun.connect
+def bind_log_context(
+    task: Any = None, args: Any = None, kwargs: Any = None, **_: Any
+) -> None:
+    """Logs de process_form_response saem com o response_id da submissão."""
+    if task is not None and task.name == "process_form_response":
+        response_id_var.set(args[0] if args else (kwargs or {}).get("response_id"))
+
+
+@task_postrun.connect
+def check_memory_budget(task: Any = None, **_: Any) -> None:
+    """
+    Amostra o RSS do processo ao fim de cada process_form_response.
+
+    A reciclagem em si é feita pelo Celery (worker_max_memory_per_child),
+    depois que a task termina; aqui fica o registro para acompanhar o
+    crescimento entre tasks.
+    """
+    if task is None or task.name != "process_form_response":
+        return
+
+    rss_mb = current_rss_kb() / 1024
+    budget_mb = Config.WORKER_MAX_MEMORY_MB
+    if budget_mb and rss_mb > budget_mb:
+        logger.warning(
+            "RSS de %.0f MB acima do orçamento de %d MB: processo será reciclado",
+            rss_mb,
+            budget_mb,
+        )
+    else:
+        logger.info("RSS após process_form_response: %.0f MB", rss_mb)
+
+
+@task_postrun.connect
+def unbind_log_context(**_: Any) -> None:
+    # Conectado depois de check_memory_budget, que ainda loga com o response_id
+    response_id_var.set(None)
+
+
+def _is_superseded(response_id: int, generation: int) -> bool:
+    """Se a resposta foi reenviada depois da geração desta execução."""
+    with Session(engine) as session:
+        current = session.exec(
+            select(FormResponse.generation).where(FormResponse.id == response_id)
+        ).first()
+    return current is not None and current != generation
+
+
+def _superseded(response_id: int, generation: int, stage: str) -> dict[str, Any]:
+    logger.info(
+        "Response %s: geração %s substituída por um reenvio, desistindo antes de %s",
+        response_id,
+        generation,
+        stage,
+    )
+    return {"status": "superseded", "response_id": response_id, "stage": stage}
+
+
+def _record_failure(
+    response_id: int, message: str, dead_letter: Optional[DeadLetter] = None
+) -> None:
+    """Grava o erro no FormResponse e, se for o caso, o dead letter."""
+    with Session(engine) as session:
+        response = session.get(FormResponse, response_id)
+        if response:
+            response.error_message = message
+            response.updated_at = datetime.utcnow()
+        if dead_letter is not None:
+            session.add(dead_letter)
+        session.commit()
+
+
+@celery.task(
+    name="process_form_response", bind=True, max_retries=Config.TASK_MAX_RETRIES
+)
+def process_form_response(
+    self: Any,
+    response_id: int,
+    enqueued_at: Optional[str] = None,
+    generation: Optional[int] = None,
+) -> dict[str, Any]:
     """
     Task principal que orquestra o processamento completo.
 
@@ -21,67 +168,149 @@ def process_form_response(self: Any, response_id: int) -> dict[str, Any]:
     2. Gera PDF
     3. Envia email
 
+    Erros transitórios são retentados com backoff exponencial e jitter;
+    erros permanentes e tentativas esgotadas vão para a tabela DeadLetter
+    (ver redrive_dead_letters.py).
+
+    O horário de cada etapa fica gravado no FormResponse (ver slo_report.py).
+
+    Antes de cada etapa a geração do FormResponse é conferida: se a resposta
+    foi reenviada, esta execução desiste e só a do reenvio gera e envia o
+    relatório.
+
     Args:
         response_id: ID do FormResponse no banco
+        enqueued_at: Horário do enfileiramento (ISO 8601, UTC), enviado pelo
+            produtor
+        generation: Geração da resposta que motivou a execução; sem ela,
+            vale a lida no início
     """
 
+    stage = "scoring"
+    tracer = StageTracer(f"response {response_id}", Config.MEMORY_TRACE_TOP_N)
     try:
+        publish_status(response_id, "scoring")
+
         with Session(engine) as session:
             # Buscar registro
             response = session.get(FormResponse, response_id)
             if not response:
-                raise Exception(f"Response {response_id} não encontrado")
+                raise ResponseNotFound(f"Response {response_id} não encontrado")
+
+            if generation is None:
+                generation = response.generation
+            elif response.generation != generation:
+                return _superseded(response_id, generation, stage)
 
-            # 1. Calcular scores
-            payload = json.loads(response.raw_payload)
-            result = process_webhook(payload)
-            scores = result["scores"]
+            if enqueued_at:
+                response.enqueued_at = datetime.fromisoformat(enqueued_at)
+            response.scoring_started_at = datetime.utcnow()
+
+            # 1. Calcular scores com o modelo do formulário
+            plan = scoring_models.get(response.form_id)
+            if response.attribute_values is not None:
+                # Atributos extraídos no recebimento: sem reler o payload
+                user = UserResponse(
+                    response.name,
+                    response.email,
+                    normalize_values(json.loads(response.attribute_values), plan),
+                )
+                result = score_response(user, plan)
+            else:
+                # Respostas gravadas antes da extração no recebimento
+                payload = json.loads(load_raw_payload(session, response))
+                result = process_webhook(payload, plan)
 
             # Atualizar scores no banco
-            response.score_agilidade = scores.get("AGILIDADE", 0)
-            response.score_agressividade = scores.get("AGRESSIVIDADE", 0)
-            response.score_atencao_detalhes = scores.get("ATENÇÃO_A_DETALHES", 0)
-            response.score_enfase_recompensas = scores.get("ÊNFASE_EM_RECOMPENSAS", 0)
-            response.score_estabilidade = scores.get("ESTABILIDADE", 0)
-            response.score_informalidade = scores.get("INFORMALIDADE", 0)
-            response.score_orientacao_resultados = scores.get(
-                "ORIENTAÇÃO_A_RESULTADOS", 0
-            )
-            response.score_trabalho_equipe = scores.get("TRABALHO_EM_EQUIPE", 0)
+            for category, column in SCORE_COLUMNS.items():
+                setattr(response, column, result["scores"].get(category, 0))
+            response.scoring_model_version = result["model_version"]
             response.processed = True
+            response.scoring_finished_at = datetime.utcnow()
+            response.updated_at = response.scoring_finished_at
             session.commit()
             session.refresh(response)
 
+        publish_status(response_id, "scored")
+        tracer.checkpoint("scoring")
+
         # 2. Gerar PDF
+        stage = "pdf"
+        if _is_superseded(response_id, generation):
+            return _superseded(response_id, generation, stage)
         pdf_path = generate_pdf(response_id)
 
         with Session(engine) as session:
             response = session.get(FormResponse, response_id)
-            if response:
+            if response and response.generation == generation:
                 response.pdf_generated = True
+                response.pdf_finished_at = datetime.utcnow()
+                response.updated_at = response.pdf_finished_at
                 session.commit()
 
-        # 3. Enviar email
-        send_email_with_pdf(response_id, pdf_path)
+        publish_status(response_id, "pdf_generated")
+        tracer.checkpoint("pdf")
+
+        # 3. Enviar email (PDF anexo ou link assinado)
+        stage = "email"
+        if _is_superseded(response_id, generation):
+            # O PDF desta geração não será enviado nem armazenado
+            Path(pdf_path).unlink(missing_ok=True)
+            return _superseded(response_id, generation, stage)
+        if Config.REPORT_DELIVERY_MODE == "link":
+            store_report(response_id, pdf_path)
+            send_email_with_link(response_id, build_download_url(response_id))
+        else:
+            send_email_with_pdf(response_id, pdf_path)
 
         with Session(engine) as session:
             response = session.get(FormResponse, response_id)
-            if response:
+            if response and response.generation == generation:
                 response.email_sent = True
+                response.error_message = None
+                response.email_accepted_at = datetime.utcnow()
+                response.updated_at = response.email_accepted_at
                 session.commit()
 
+        publish_status(response_id, "email_sent")
+        tracer.checkpoint("email")
+
         return {"status": "success", "response_id": response_id}
 
     except Exception as e:
-        # Salvar erro no banco
-        with Session(engine) as session:
-            response = session.get(FormResponse, response_id)
-            if response:
-                response.error_message = str(e)
-                session.commit()
+        kind = classify_exception(e)
+
+        if kind == TRANSIENT and self.request.retries < self.max_retries:
+            _record_failure(response_id, format_error(kind, stage, e))
+            publish_status(response_id, "retrying")
+            # A geração vai junto para a retentativa não assumir um reenvio
+            raise self.retry(
+                exc=e,
+                countdown=retry_countdown(self.request.retries),
+                kwargs={**self.request.kwargs, "generation": generation},
+            )
 
-        # Retry automático do Celery
-        raise self.retry(exc=e, countdown=60)
+        # Falha definitiva: erro permanente ou tentativas esgotadas
+        final_kind = PERMANENT if kind == PERMANENT else EXHAUSTED
+        _record_failure(
+            response_id,
+            format_error(final_kind, stage, e),
+            DeadLetter(
+                response_id=response_id,
+                task_name=self.name,
+                stage=stage,
+                kind=final_kind,
+                exception_type=type(e).__name__,
+                error_message=str(e),
+                attempts=self.request.retries + 1,
+            ),
+        )
+        publish_status(response_id, "error")
+        raise
 
 
-__all__ = ["process_form_response"]
+__all__ = [
+    "process_form_response",
+    "render_reports_batch",
+    "sweep_stale_responses",
+]
@@ -0,0 +1,37 @@
+from typing import Any, Optional
+
+from app.celery_app import celery
+from app.utils.batch_render import (
+    iter_rendered_reports_inline,
+    load_render_jobs,
+    write_reports,
+)
+
+
+@celery.task(name="render_reports_batch")
+def render_reports_batch(
+    response_ids: list[int],
+    output_dir: Optional[str] = None,
+    archive_path: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    Regera em lote os relatórios de várias respostas (reenvios, backfills).
+
+    Renderiza no próprio processo do worker; lotes grandes rendem mais
+    divididos em várias tasks, que o worker bulk executa em paralelo.
+
+    Args:
+        response_ids: IDs dos FormResponse
+        output_dir: Diretório de destino dos PDFs
+        archive_path: Alternativa a output_dir: caminho de um arquivo ZIP
+    """
+    jobs = load_render_jobs(response_ids)
+    count = write_reports(
+        iter_rendered_reports_inline(jobs), output_dir, archive_path
+    )
+
+    return {
+        "requested": len(response_ids),
+        "rendered": count,
+        "missing": len(set(response_ids)) - len(jobs),
+    }
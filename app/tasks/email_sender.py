@@ -1,3 +1,4 @@
+import logging
 import mimetypes
 import os
 import re
@@ -5,15 +6,39 @@ import smtplib
 import ssl
 from email.message import EmailMessage
 from email.utils import formataddr, parseaddr
+from functools import cache
 
 from sqlmodel import Session
 
 from app.config import Config
 from app.models.form_response import FormResponse
+from app.tasks.errors import PermanentError, ResponseNotFound
 from app.utils.database import engine
 
 _FILENAME_SAFE_RE = re.compile(r"[^A-Za-z0-9_.-]")  # para sanitizar nomes de arquivo
 
+logger = logging.getLogger(__name__)
+smtp_logger = logging.getLogger("app.smtp")
+
+# Tamanho máximo de cada linha da conversa SMTP no log (o DATA traz o PDF)
+SMTP_DEBUG_MAX_CHARS = 200
+
+
+class _LoggingSMTPMixin:
+    """Conversa SMTP pelo logging (nível DEBUG, amostrado) em vez do stderr."""
+
+    def _print_debug(self, *args):
+        line = " ".join(str(arg) for arg in args)
+        smtp_logger.debug(line[:SMTP_DEBUG_MAX_CHARS])
+
+
+class _SMTP(_LoggingSMTPMixin, smtplib.SMTP):
+    pass
+
+
+class _SMTP_SSL(_LoggingSMTPMixin, smtplib.SMTP_SSL):  # noqa: N801
+    pass
+
 
 def _sanitize_filename(name: str) -> str:
     """Substitui caracteres inseguros por underscore e limita tamanho."""
@@ -41,20 +66,26 @@ def _extract_display_name(raw_from: str, smtp_user: str) -> str:
     return "Na Prática - Insper"
 
 
-def send_email_with_pdf(response_id: int, pdf_path: str):
-    """
-    Envia e-mail com anexo usando EmailMessage.
-    - Header From: usa display name tirado de Config.SMTP_FROM (ou fallback) e endereço = Config.SMTP_USER
-    - Não é necessário especificar `from_addr` no envio (o header já é igual ao SMTP_USER)
-    - Sanitiza filename e response.name para o anexo
-    """
+@cache
+def get_ssl_context() -> ssl.SSLContext:
+    """Contexto TLS criado uma vez por processo (carregar as CAs é caro)."""
+    return ssl.create_default_context()
 
-    # pega o response (somente leitura)
+
+def _load_response(response_id: int) -> FormResponse:
+    """Busca o FormResponse (somente leitura)."""
     with Session(engine) as session:
         response = session.get(FormResponse, response_id)
         if not response:
-            raise Exception(f"Resposta {response_id} não encontrada")
+            raise ResponseNotFound(f"Resposta {response_id} não encontrada")
+        return response
 
+
+def _build_message(response: FormResponse, body: str) -> EmailMessage:
+    """
+    Monta o EmailMessage com headers padrão.
+    - Header From: usa display name tirado de Config.SMTP_FROM (ou fallback) e endereço = Config.SMTP_USER
+    """
     # validações mínimas de config
     if not (
         Config.SMTP_HOST
@@ -62,11 +93,7 @@ def send_email_with_pdf(response_id: int, pdf_path: str):
         and Config.SMTP_USER
         and Config.SMTP_PASSWORD
     ):
-        raise Exception("Configurações SMTP incompletas")
-
-    # checagem do anexo
-    if not os.path.exists(pdf_path):
-        raise FileNotFoundError(pdf_path)
+        raise PermanentError("Configurações SMTP incompletas")
 
     # extrai display name a partir da configuração (pode ser "Nome <email>" ou só "Nome" ou só "email")
     display_name = _extract_display_name(
@@ -87,6 +114,55 @@ def send_email_with_pdf(response_id: int, pdf_path: str):
         if reply_email:
             msg["Reply-To"] = reply_email
 
+    msg.set_content(body)
+    return msg
+
+
+def _deliver(msg: EmailMessage, to_addr: str) -> None:
+    """Envia a mensagem pelo servidor SMTP configurado."""
+    port = int(Config.SMTP_PORT)
+    use_tls = bool(Config.SMTP_USE_TLS)
+    ctx = get_ssl_context()
+
+    # Observação: não passamos explicitamente from_addr para send_message/sendmail.
+    # Como msg["From"] já contém Config.SMTP_USER, o envelope MAIL FROM enviado pelo cliente
+    # normalmente será esse mesmo; isso mantém sua condição "não especificar ADDR".
+    # A conversa só é montada se o DEBUG do logger estiver ligado
+    debuglevel = 1 if smtp_logger.isEnabledFor(logging.DEBUG) else 0
+
+    if use_tls:
+        with _SMTP(Config.SMTP_HOST, port, timeout=30) as s:
+            s.set_debuglevel(debuglevel)
+            s.ehlo()
+            s.starttls(context=ctx)
+            s.ehlo()
+            s.login(Config.SMTP_USER, Config.SMTP_PASSWORD)  # type: ignore
+            # send_message usa os headers para determinar envelope quando from_addr não é passado
+            s.send_message(msg, to_addrs=[to_addr])
+    else:
+        with _SMTP_SSL(Config.SMTP_HOST, port, context=ctx, timeout=30) as s:
+            s.set_debuglevel(debuglevel)
+            s.login(Config.SMTP_USER, Config.SMTP_PASSWORD)  # type: ignore
+            s.send_message(msg, to_addrs=[to_addr])
+
+    logger.info("Email aceito pelo servidor SMTP")
+
+
+def send_email_with_pdf(response_id: int, pdf_path: str):
+    """
+    Envia e-mail com anexo usando EmailMessage.
+    - Header From: usa display name tirado de Config.SMTP_FROM (ou fallback) e endereço = Config.SMTP_USER
+    - Não é necessário especificar `from_addr` no envio (o header já é igual ao SMTP_USER)
+    - Sanitiza filename e response.name para o anexo
+    """
+
+    # pega o response (somente leitura)
+    response = _load_response(response_id)
+
+    # checagem do anexo
+    if not os.path.exists(pdf_path):
+        raise FileNotFoundError(pdf_path)
+
     # corpo
     body = f"""Olá {response.name},
 
@@ -97,7 +173,7 @@ Seu relatório personalizado está em anexo.
 Atenciosamente,
 Equipe Na Prática - Insper
 """
-    msg.set_content(body)
+    msg = _build_message(response, body)
 
     # anexo: detecta mime-type e anexa
     ctype, _ = mimetypes.guess_type(pdf_path)
@@ -113,30 +189,51 @@ Equipe Na Prática - Insper
         msg.add_attachment(data, maintype=maintype, subtype=subtype, filename=safe_name)
 
     # envio
-    port = int(Config.SMTP_PORT)
-    use_tls = bool(Config.SMTP_USE_TLS)
-    ctx = ssl.create_default_context()
-
-    # Observação: não passamos explicitamente from_addr para send_message/sendmail.
-    # Como msg["From"] já contém Config.SMTP_USER, o envelope MAIL FROM enviado pelo cliente
-    # normalmente será esse mesmo; isso mantém sua condição "não especificar ADDR".
-    if use_tls:
-        with smtplib.SMTP(Config.SMTP_HOST, port, timeout=30) as s:
-            s.set_debuglevel(1)  # remover em produção se quiser
-            s.ehlo()
-            s.starttls(context=ctx)
-            s.ehlo()
-            s.login(Config.SMTP_USER, Config.SMTP_PASSWORD)
-            # send_message usa os headers para determinar envelope quando from_addr não é passado
-            s.send_message(msg, to_addrs=[response.email])
-    else:
-        with smtplib.SMTP_SSL(Config.SMTP_HOST, port, context=ctx, timeout=30) as s:
-            s.set_debuglevel(1)
-            s.login(Config.SMTP_USER, Config.SMTP_PASSWORD)
-            s.send_message(msg, to_addrs=[response.email])
+    _deliver(msg, response.email)
 
     # tenta remover o PDF temporário (não explodir se falhar)
     try:
         os.remove(pdf_path)
     except Exception:
         pass
+
+
+def _format_validity(seconds: int) -> str:
+    """
+    Validade do link por extenso ("7 dias", "1 hora", "30 minutos").
+
+    Dias quando o TTL é um número exato de dias; senão horas ou minutos,
+    arredondados para baixo para não prometer mais tempo do que o link vale.
+    """
+    if seconds >= 86400 and seconds % 86400 == 0:
+        amount, singular, plural = seconds // 86400, "dia", "dias"
+    elif seconds >= 3600:
+        amount, singular, plural = seconds // 3600, "hora", "horas"
+    else:
+        amount, singular, plural = max(1, seconds // 60), "minuto", "minutos"
+    return f"{amount} {singular if amount == 1 else plural}"
+
+
+def send_email_with_link(response_id: int, download_url: str):
+    """
+    Envia e-mail com link assinado para download do relatório, sem anexo.
+
+    A mensagem fica com poucos KB, o que acelera o envio e economiza a cota
+    do provedor SMTP.
+    """
+    response = _load_response(response_id)
+    validade = _format_validity(Config.REPORT_LINK_TTL_SECONDS)
+
+    body = f"""Olá {response.name},
+
+Obrigado por participar do Teste de Estilos de Trabalho!
+
+Seu relatório personalizado está disponível no link abaixo (válido por {validade}):
+
+{download_url}
+
+Atenciosamente,
+Equipe Na Prática - Insper
+"""
+    msg = _build_message(response, body)
+    _deliver(msg, response.email)
@@ -0,0 +1,61 @@
+import random
+import smtplib
+
+from app.config import Config
+
+# Classificação dos erros do pipeline
+TRANSIENT = "transient"  # vale tentar de novo (timeout, conexão, 4xx SMTP)
+PERMANENT = "permanent"  # retry não resolve (registro inexistente, auth SMTP)
+EXHAUSTED = "exhausted"  # transitório, mas as tentativas acabaram
+
+# Prefixo de error_message de falhas que ainda serão tentadas (ver format_error)
+TRANSIENT_ERROR_PREFIX = f"[{TRANSIENT}:"
+
+
+class PermanentError(Exception):
+    """Erro que não se resolve com retry."""
+
+
+class ResponseNotFound(PermanentError):
+    """FormResponse inexistente (ex: removido depois do enfileiramento)."""
+
+
+_PERMANENT_TYPES: tuple[type[BaseException], ...] = (
+    PermanentError,
+    FileNotFoundError,
+    ValueError,  # inclui json.JSONDecodeError
+    KeyError,
+    TypeError,
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPNotSupportedError,
+)
+
+
+def classify_exception(exc: BaseException) -> str:
+    """
+    Classifica a exceção como TRANSIENT ou PERMANENT.
+
+    Respostas SMTP usam o código: 5xx (inclui falha de autenticação) é
+    permanente, 4xx é transitório. Todo o resto (conexão, timeout, banco
+    indisponível, erros desconhecidos) é transitório, limitado pelo número
+    máximo de tentativas.
+    """
+    if isinstance(exc, _PERMANENT_TYPES):
+        return PERMANENT
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return PERMANENT if 500 <= exc.smtp_code < 600 else TRANSIENT
+    return TRANSIENT
+
+
+def retry_countdown(retries: int) -> float:
+    """
+    Backoff exponencial com jitter ("equal jitter"): metade do intervalo é
+    fixa e a outra metade aleatória, para espalhar retries simultâneos.
+    """
+    delay = min(Config.RETRY_MAX_SECONDS, Config.RETRY_BASE_SECONDS * 2**retries)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def format_error(kind: str, stage: str, exc: BaseException) -> str:
+    """Formato do error_message: "[<tipo>:<etapa>] <Exceção>: <mensagem>"."""
+    return f"[{kind}:{stage}] {type(exc).__name__}: {exc}"
@@ -1,201 +1,12 @@
 import os
-from datetime import datetime
-from typing import TypedDict
 
-import fitz
 from sqlmodel import Session
 
 from app.models.form_response import FormResponse
+from app.tasks.errors import ResponseNotFound
 from app.utils.database import engine
-
-
-class ReplacementConfig(TypedDict):
-    """Configuração de substituição de texto no PDF."""
-
-    text: str
-    fontname: str
-    fontsize: int
-    color: tuple[float, float, float]
-    align: int
-    expand_right: float
-    expand_down: float
-
-
-# Constantes
-GRAY_COLOR = (0.26, 0.26, 0.26)
-BLACK_COLOR = (0, 0, 0)
-
-NIVEL_THRESHOLDS = {
-    "BAIXO": (0, 3.5),
-    "MÉDIO": (3.5, 7.0),
-    "ALTO": (7.0, 10.0),
-}
-
-FONT_CONFIGS = {
-    "titulo": {
-        "fontname": "hebo",
-        "fontsize": 20,
-        "color": BLACK_COLOR,
-        "expand_right": 200,  # Expandir para direita
-        "expand_down": 0,
-    },
-    "subtitulo": {
-        "fontname": "helv",
-        "fontsize": 18,
-        "color": BLACK_COLOR,
-        "expand_right": 200,  # Expandir para direita
-        "expand_down": 0,
-    },
-    "score": {
-        "fontname": "hebo",
-        "fontsize": 42,
-        "color": GRAY_COLOR,
-        "expand_right": 0,
-        "expand_down": 0,
-    },
-    "nivel": {
-        "fontname": "helv",
-        "fontsize": 16,
-        "color": GRAY_COLOR,
-        "expand_right": 0,
-        "expand_down": 0,
-    },
-    "descritivo": {
-        "fontname": "helv",
-        "fontsize": 11,  # Reduzido de 12 para 11
-        "color": GRAY_COLOR,
-        "expand_right": 150,  # Expandir bastante para direita
-        "expand_down": 30,  # Expandir para baixo para quebra de linha
-    },
-}
-
-
-def get_nivel(score: float) -> str:
-    """Determina o nível baseado no score (0-10)."""
-    for nivel, (min_val, max_val) in NIVEL_THRESHOLDS.items():
-        if min_val <= score < max_val:
-            return nivel
-    return "ALTO"
-
-
-def get_descritivo(categoria: str, score: float) -> str:
-    """Retorna texto descritivo baseado no score da categoria."""
-    nivel = get_nivel(score)
-    categoria_formatada = categoria.lower()
-
-    descritivos = {
-        "ALTO": f"Você apresenta forte preferência por ambientes com alta {categoria_formatada}.",
-        "MÉDIO": f"Você apresenta preferência moderada por ambientes com {categoria_formatada}.",
-        "BAIXO": f"Você apresenta baixa preferência por ambientes com {categoria_formatada}.",
-    }
-
-    return descritivos[nivel]
-
-
-def create_replacement(
-    text: str, config_type: str, align: int = fitz.TEXT_ALIGN_LEFT
-) -> ReplacementConfig:
-    """Cria configuração de substituição baseada no tipo."""
-    config = FONT_CONFIGS[config_type].copy()
-    config["text"] = text
-    config["align"] = align
-    return config  # type: ignore
-
-
-def build_replacements(response: FormResponse) -> dict[str, ReplacementConfig]:
-    """Constrói dicionário de substituições a partir do FormResponse."""
-    data_atual = datetime.now().strftime("%d/%m/%Y")
-
-    # Mapeamento de scores
-    scores = {
-        "agilidade": response.score_agilidade or 0,
-        "agressividade": response.score_agressividade or 0,
-        "atencao_detalhes": response.score_atencao_detalhes or 0,
-        "enfase_recompensas": response.score_enfase_recompensas or 0,
-        "estabilidade": response.score_estabilidade or 0,
-        "informalidade": response.score_informalidade or 0,
-        "orientacao_resultados": response.score_orientacao_resultados or 0,
-        "trabalho_equipe": response.score_trabalho_equipe or 0,
-    }
-
-    replacements = {
-        # Cabeçalho
-        "{{nome}}": create_replacement(response.name, "titulo"),
-        "{{email}}": create_replacement(response.email, "subtitulo"),
-        "{{data}}": create_replacement(data_atual, "subtitulo"),
-    }
-
-    # Configuração das categorias com placeholders corretos
-    categorias = [
-        ("agilidade", "agilidade", "{{DESCRITIVO-AGILIDADE}}"),
-        ("agressividade", "agressividade", "{{DESCRITIVO-AGRESSIVIDADE}}"),
-        ("atencao_detalhes", "atenção a detalhes", "{{DESCRITIVO-ATENCAO-DETALHES}}"),
-        (
-            "enfase_recompensas",
-            "ênfase em recompensa",
-            "{{DESCRITIVO-ENFASE-RECOMPENSA}}",
-        ),
-        ("estabilidade", "estabilidade", "{{DESCRITIVO-ESTABILIDADE}}"),
-        ("informalidade", "informalidade", "{{DESCRITIVO-INFORMALIDADE}}"),
-        (
-            "orientacao_resultados",
-            "orientação para resultado",
-            "{{DESCRITIVO-ORIENTACAO-RESULTADO}}",
-        ),
-        ("trabalho_equipe", "trabalho em equipe", "{{TRABALHO-EQUIPE}}"),
-    ]
-
-    for idx, (key, nome_categoria, placeholder_descritivo) in enumerate(
-        categorias, start=1
-    ):
-        score = scores[key]
-
-        # Score numérico
-        replacements[f"{{{idx}}}"] = create_replacement(
-            f"{score:.1f}", "score", fitz.TEXT_ALIGN_CENTER
-        )
-
-        # Nível
-        replacements[f"{{{{nivel{idx}}}}}"] = create_replacement(
-            get_nivel(score), "nivel", fitz.TEXT_ALIGN_CENTER
-        )
-
-        # Descritivo
-        replacements[placeholder_descritivo] = create_replacement(
-            get_descritivo(nome_categoria, score), "descritivo"
-        )
-
-    return replacements
-
-
-def apply_replacements(
-    doc: fitz.Document, replacements: dict[str, ReplacementConfig]
-) -> None:
-    """Aplica substituições em todas as páginas do documento."""
-    for page in doc:
-        for placeholder, config in replacements.items():
-            text_instances = page.search_for(placeholder)
-
-            for inst in text_instances:
-                # Expandir retângulo apenas para direita e para baixo
-                expanded_rect = fitz.Rect(
-                    inst.x0,  # Mantém a posição esquerda
-                    inst.y0,  # Mantém a posição superior
-                    inst.x1 + config["expand_right"],  # Expande para direita
-                    inst.y1 + config["expand_down"],  # Expande para baixo
-                )
-
-                # Adicionar redação com área expandida
-                page.add_redact_annot(
-                    expanded_rect,
-                    text=config["text"],
-                    fontname=config["fontname"],
-                    fontsize=config["fontsize"],
-                    text_color=config["color"],
-                    align=config["align"],
-                )
-
-        page.apply_redactions()
+from app.utils.rendering import build_replacements, render_report, report_filename
+from app.utils.template_registry import get_template
 
 
 def generate_pdf(response_id: int) -> str:
@@ -211,27 +22,22 @@ def generate_pdf(response_id: int) -> str:
     with Session(engine) as session:
         response = session.get(FormResponse, response_id)
         if not response:
-            raise ValueError(f"Response {response_id} não encontrado")
+            raise ResponseNotFound(f"Response {response_id} não encontrado")
 
-        # Validar template
-        template_path = os.path.join(os.getcwd(), "relatorio_template.pdf")
-        if not os.path.exists(template_path):
-            raise FileNotFoundError(f"Template não encontrado: {template_path}")
+        # Template em memória (por formId, com fallback para o padrão)
+        template = get_template(response.form_id)
 
         # Processar PDF
-        doc = fitz.open(template_path)
-        replacements = build_replacements(response)
-        apply_replacements(doc, replacements)
+        pdf_bytes = render_report(template.data, build_replacements(response))
 
         # Salvar
         output_dir = "/tmp"
         os.makedirs(output_dir, exist_ok=True)
-        output_filename = (
-            f"relatorio_{response_id}_{response.email.replace('@', '_')}.pdf"
+        output_path = os.path.join(
+            output_dir, report_filename(response_id, response.email)
         )
-        output_path = os.path.join(output_dir, output_filename)
 
-        doc.save(output_path)
-        doc.close()
+        with open(output_path, "wb") as f:
+            f.write(pdf_bytes)
 
         return output_path
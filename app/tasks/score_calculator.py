@@ -1,10 +1,7 @@
 from dataclasses import dataclass
 
-from app.utils.attributes_mapping import (
-    ATTRIBUTE_NORMALIZE,
-    CATEGORIES,
-    INVERTED_ATTRIBUTES,
-)
+from app.tasks.scoring_models import BUILTIN_PLAN, ScoringPlan
+from app.utils.tally_payload import TallyData, TallyWebhook
 
 
 @dataclass
@@ -14,95 +11,58 @@ class UserResponse:
     attribute_values: dict[str, float]  # atributo -> valor (0, 1, ou ranking 1-9)
 
 
-def parse_webhook(payload: dict) -> UserResponse:
+def normalize_values(
+    attribute_values: dict[str, float], plan: ScoringPlan = BUILTIN_PLAN
+) -> dict[str, float]:
+    """Aplica a normalização dos nomes dos atributos do modelo."""
+    return {
+        plan.normalize_attribute(attr): val for attr, val in attribute_values.items()
+    }
+
+
+def parse_webhook(payload: dict, plan: ScoringPlan = BUILTIN_PLAN) -> UserResponse:
     """
     Extrai informações do payload do webhook do Tally.
 
     Args:
         payload: Payload JSON do webhook
+        plan: Modelo de pontuação (normalização dos nomes dos atributos)
 
     Returns:
         UserResponse com nome, email e valores dos atributos
     """
-    fields = payload["data"]["fields"]
-    name = email = ""
-    attr_values = {}
-
-    # Mapear IDs para textos
-    id_to_text = {}
-
-    for f in fields:
-        label = f.get("label", "")
-        value = f.get("value")
-
-        if "nome" in label.lower():
-            name = value or ""
-        elif "e-mail" in label.lower():
-            email = value or ""
-        elif "MAIS importantes" in label and f.get("type") == "CHECKBOXES":
-            # Selecionar 16 MAIS importantes -> valor = 1
-            for opt in f.get("options", []):
-                id_to_text[opt["id"]] = opt["text"]
-            selected = value if isinstance(value, list) else []
-            for attr_id in selected:
-                if attr_id in id_to_text:
-                    attr_values[id_to_text[attr_id]] = 1.0
-        elif "MENOS importantes" in label and f.get("type") == "CHECKBOXES":
-            # Checkbox individual MENOS importante -> valor = 0
-            if "(" in label and ")" in label:
-                attr_text = label.split("(")[1].split(")")[0]
-                if value is True:
-                    attr_values[attr_text] = 0.0
-        elif "ranqueie" in label.lower() and f.get("type") == "RANKING":
-            # Mapear ranking - a ordem na lista É o ranking
-            # Posição 0 = rank 1 (MAIS importante), posição 8 = rank 9 (MENOS importante)
-            for opt in f.get("options", []):
-                id_to_text[opt["id"]] = opt["text"]
-
-            if value and isinstance(value, list):
-                for rank, opt_id in enumerate(value, 1):  # 1-based
-                    if opt_id in id_to_text:
-                        attr_values[id_to_text[opt_id]] = float(rank)
-
-    # Normalizar nomes
-    normalized_values = {}
-    for attr, val in attr_values.items():
-        normalized = ATTRIBUTE_NORMALIZE.get(attr.lower(), attr)
-        normalized_values[normalized] = val
-
-    return UserResponse(name, email, normalized_values)
-
-
-def calculate_scores(response: UserResponse) -> dict[str, float]:
+    data = TallyWebhook.model_validate(payload).data or TallyData()
+    name, email = data.contact()
+    return UserResponse(name, email, normalize_values(data.attribute_values(), plan))
+
+
+def calculate_scores(
+    response: UserResponse, plan: ScoringPlan = BUILTIN_PLAN
+) -> dict[str, float]:
     """
     Calcula os scores para cada categoria baseado nos valores dos atributos.
 
     Args:
         response: UserResponse com os valores dos atributos
+        plan: Modelo de pontuação compilado
 
     Returns:
         Dicionário com nome da categoria -> score (0-10)
     """
-    scores = {}
+    soma = dict.fromkeys(plan.categories, 0.0)
+    count = dict.fromkeys(plan.categories, 0)
 
-    for category, attrs in CATEGORIES.items():
-        inverted = INVERTED_ATTRIBUTES.get(category, [])
-
-        # Somar valores dos atributos
-        soma = 0.0
-        count = 0
-        for attr in attrs:
-            if attr in response.attribute_values:
-                val = response.attribute_values[attr]
-                # Se invertido, fazer 10 - val
-                if attr in inverted:
-                    val = 10.0 - val
-                soma += val
-                count += 1
+    # Somar valores dos atributos (invertidos: 10 - val)
+    for attr, val in response.attribute_values.items():
+        for category, inverted in plan.lookup.get(attr, ()):
+            soma[category] += 10.0 - val if inverted else val
+            count[category] += 1
 
+    scores = {}
+    for category in plan.categories:
         # Fórmula: ((soma/n) - 1) * 1.25
-        if count > 0:
-            score = ((soma / count) - 1) * 1.25
+        if count[category] > 0:
+            score = ((soma[category] / count[category]) - 1) * 1.25
         else:
             score = 0.0
 
@@ -111,21 +71,37 @@ def calculate_scores(response: UserResponse) -> dict[str, float]:
     return scores
 
 
-def process_webhook(payload: dict) -> dict:
+def score_response(response: UserResponse, plan: ScoringPlan = BUILTIN_PLAN) -> dict:
     """
-    Processa o payload do webhook e retorna os scores calculados.
+    Calcula os scores de uma resposta já extraída.
 
     Args:
-        payload: Payload JSON do webhook do Tally
+        response: UserResponse com os valores dos atributos (normalizados)
+        plan: Modelo de pontuação compilado
 
     Returns:
-        Dicionário com informações do usuário, scores e valores dos atributos
+        Dicionário com informações do usuário, scores, valores dos atributos e
+        versão do modelo usado
     """
-    response = parse_webhook(payload)
-    scores = calculate_scores(response)
+    scores = calculate_scores(response, plan)
 
     return {
         "user": {"name": response.name, "email": response.email},
         "scores": scores,
         "attribute_values": response.attribute_values,
+        "model_version": plan.version,
     }
+
+
+def process_webhook(payload: dict, plan: ScoringPlan = BUILTIN_PLAN) -> dict:
+    """
+    Processa o payload do webhook e retorna os scores calculados.
+
+    Args:
+        payload: Payload JSON do webhook do Tally
+        plan: Modelo de pontuação compilado
+
+    Returns:
+        Mesmo dicionário de score_response
+    """
+    return score_response(parse_webhook(payload, plan), plan)
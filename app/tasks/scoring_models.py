@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.config import Config
+from app.utils.attributes_mapping import (
+    ATTRIBUTE_NORMALIZE,
+    CATEGORIES,
+    INVERTED_ATTRIBUTES,
+)
+from app.utils.hot_reload import ReloadingFileCache
+
+DEFAULT_MODEL_KEY = "default"
+
+# Categoria -> coluna do FormResponse onde o score é gravado
+SCORE_COLUMNS = {
+    "AGILIDADE": "score_agilidade",
+    "AGRESSIVIDADE": "score_agressividade",
+    "ATENÇÃO_A_DETALHES": "score_atencao_detalhes",
+    "ÊNFASE_EM_RECOMPENSAS": "score_enfase_recompensas",
+    "ESTABILIDADE": "score_estabilidade",
+    "INFORMALIDADE": "score_informalidade",
+    "ORIENTAÇÃO_A_RESULTADOS": "score_orientacao_resultados",
+    "TRABALHO_EM_EQUIPE": "score_trabalho_equipe",
+}
+
+
+@dataclass(frozen=True)
+class ScoringPlan:
+    """
+    Modelo de pontuação compilado.
+
+    `lookup` leva cada atributo (já normalizado) às categorias em que ele
+    conta e se entra invertido (10 - valor), então o cálculo percorre só os
+    atributos respondidos, uma vez.
+    """
+
+    version: str  # "<modelo>@<versão declarada ou hash do conteúdo>"
+    categories: tuple[str, ...]
+    normalize: dict[str, str]  # texto em minúsculas -> atributo
+    lookup: dict[str, tuple[tuple[str, bool], ...]]
+
+    def normalize_attribute(self, text: str) -> str:
+        return self.normalize.get(text.lower(), text)
+
+
+def compile_plan(name: str, definition: dict[str, Any], version: str) -> ScoringPlan:
+    """
+    Valida e compila a definição de um modelo.
+
+    Formato: {"version": "...", "categories": {categoria: [atributos]},
+    "inverted": {categoria: [atributos]}, "normalize": {texto: atributo}}
+    """
+    categories: dict[str, list[str]] = definition["categories"]
+    inverted: dict[str, list[str]] = definition.get("inverted", {})
+
+    unknown = set(categories) - set(SCORE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Categorias desconhecidas no modelo {name}: {unknown}")
+
+    lookup: dict[str, list[tuple[str, bool]]] = {}
+    for category, attrs in categories.items():
+        inverted_attrs = set(inverted.get(category, ()))
+        if not inverted_attrs <= set(attrs):
+            raise ValueError(
+                f"Atributos invertidos fora da categoria {category} no modelo {name}"
+            )
+        for attr in attrs:
+            lookup.setdefault(attr, []).append((category, attr in inverted_attrs))
+
+    return ScoringPlan(
+        version=f"{name}@{definition.get('version') or version}",
+        categories=tuple(categories),
+        normalize={
+            text.lower(): attr for text, attr in definition.get("normalize", {}).items()
+        },
+        lookup={attr: tuple(entries) for attr, entries in lookup.items()},
+    )
+
+
+def _builtin_plan() -> ScoringPlan:
+    definition = {
+        "categories": CATEGORIES,
+        "inverted": INVERTED_ATTRIBUTES,
+        "normalize": ATTRIBUTE_NORMALIZE,
+    }
+    digest = hashlib.sha256(
+        json.dumps(definition, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:12]
+    return compile_plan("builtin", definition, digest)
+
+
+def _parse_model(path: str, data: bytes) -> ScoringPlan:
+    """
+    Compila o arquivo uma única vez na carga (e a cada alteração). O nome do
+    arquivo identifica o modelo na versão gravada no FormResponse.
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    return compile_plan(name, json.loads(data), hashlib.sha256(data).hexdigest()[:12])
+
+
+BUILTIN_PLAN = _builtin_plan()
+
+
+class ScoringModelRegistry:
+    """
+    Registro de modelos de pontuação por formId.
+
+    Cada arquivo JSON é compilado em um ScoringPlan uma vez por processo e
+    recompilado automaticamente quando muda (ver ReloadingFileCache). Um
+    arquivo inválido é ignorado e a versão anterior continua valendo.
+    """
+
+    def __init__(self, models: dict[str, str], poll_interval: float) -> None:
+        self._paths = {key: os.path.abspath(path) for key, path in models.items()}
+        self._cache = ReloadingFileCache(_parse_model, poll_interval)
+
+    def get(self, key: Optional[str] = None) -> ScoringPlan:
+        """Modelo do formId (cai no 'default' e depois no embutido)."""
+        path = self._paths.get(key or "") or self._paths.get(DEFAULT_MODEL_KEY)
+        if path is None:
+            return BUILTIN_PLAN
+        try:
+            return self._cache.get(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Modelo de pontuação não encontrado: {path}"
+            ) from None
+
+    def preload(self) -> None:
+        """Compila todos os modelos registrados (ex: no início do worker)."""
+        for key in self._paths:
+            self.get(key)
+
+
+registry = ScoringModelRegistry(
+    Config.SCORING_MODELS, Config.SCORING_MODEL_RELOAD_INTERVAL_SECONDS
+)
+
+
+def get_scoring_plan(key: Optional[str] = None) -> ScoringPlan:
+    """Atalho para registry.get()."""
+    return registry.get(key)
@@ -0,0 +1,75 @@
+import random
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlmodel import Session, and_, or_, select, update
+
+from app.celery_app import celery
+from app.config import Config
+from app.models.form_response import FormResponse
+from app.tasks.errors import TRANSIENT_ERROR_PREFIX
+from app.utils.database import engine
+from app.utils.dispatch import enqueue_form_response
+
+
+def retryable_error_clause(retry_stale_before: datetime):
+    """
+    Filtro SQL das submissões que podem ser reenfileiradas: sem erro, ou com
+    erro transitório parado há mais tempo que o maior backoff de retry (antes
+    disso o próprio retry do Celery ainda vai rodar). Erros permanentes e
+    tentativas esgotadas ficam na tabela de dead letters.
+    """
+    return or_(
+        FormResponse.error_message.is_(None),  # type: ignore
+        and_(
+            FormResponse.error_message.startswith(TRANSIENT_ERROR_PREFIX),  # type: ignore
+            FormResponse.updated_at < retry_stale_before,
+        ),
+    )
+
+
+@celery.task(name="sweep_stale_responses")
+def sweep_stale_responses() -> dict[str, Any]:
+    """
+    Reenfileira submissões travadas (processed=False ou email_sent=False)
+    sem atualização há mais de SWEEPER_STALE_AFTER_SECONDS.
+
+    A busca usa o índice parcial ix_formresponse_pending_updated_at. Os
+    registros são reenfileirados em lotes limitados, com jitter no countdown
+    para não disparar todos de uma vez, e têm o updated_at renovado para não
+    serem pegos de novo na próxima varredura. Submissões com falha definitiva
+    ou mais antigas que SWEEPER_MAX_AGE_HOURS são ignoradas.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=Config.SWEEPER_STALE_AFTER_SECONDS)
+    retry_stale_before = stale_before - timedelta(seconds=Config.RETRY_MAX_SECONDS)
+    oldest = now - timedelta(hours=Config.SWEEPER_MAX_AGE_HOURS)
+
+    with Session(engine) as session:
+        statement = (
+            select(FormResponse.id)
+            .where(or_(~FormResponse.processed, ~FormResponse.email_sent))
+            .where(FormResponse.updated_at < stale_before)
+            .where(FormResponse.created_at >= oldest)
+            .where(retryable_error_clause(retry_stale_before))
+            .order_by(FormResponse.updated_at)
+            .limit(Config.SWEEPER_BATCH_SIZE)
+        )
+        requeue_ids = list(session.exec(statement).all())
+
+        if requeue_ids:
+            session.exec(
+                update(FormResponse)
+                .where(FormResponse.id.in_(requeue_ids))  # type: ignore
+                .values(updated_at=now)
+            )
+            session.commit()
+
+    for response_id in requeue_ids:
+        enqueue_form_response(
+            response_id,
+            lane=Config.SWEEPER_LANE,
+            countdown=random.uniform(0, Config.SWEEPER_MAX_JITTER_SECONDS),
+        )
+
+    return {"requeued": len(requeue_ids)}
@@ -0,0 +1,248 @@
+import multiprocessing
+import os
+import threading
+import zipfile
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from sqlalchemy.orm import defer
+from sqlmodel import Session, select
+
+from app.config import Config
+from app.models.form_response import FormResponse
+from app.utils.database import engine
+from app.utils.export import (
+    EXPORT_COLUMNS,
+    ChunkSink,
+    ExportFilters,
+    iter_response_chunks,
+)
+from app.utils.rendering import (
+    ReplacementConfig,
+    build_replacements,
+    render_report,
+    report_filename,
+)
+from app.utils.template_registry import registry
+
+# (response_id, nome do arquivo, chave do template, substituições)
+RenderJob = tuple[int, str, str, dict[str, ReplacementConfig]]
+
+
+def _init_render_worker() -> None:
+    """Inicializador do pool: carrega os templates em memória no processo filho."""
+    registry.preload()
+
+
+def _render_job(job: RenderJob) -> tuple[int, str, bytes]:
+    response_id, filename, template_key, replacements = job
+    template = registry.get(template_key)
+    return response_id, filename, render_report(template.data, replacements)
+
+
+def load_render_jobs(response_ids: Iterable[int]) -> list[RenderJob]:
+    """Carrega todas as respostas em uma única query e monta os jobs."""
+    ids = list(dict.fromkeys(response_ids))
+    if not ids:
+        return []
+
+    with Session(engine) as session:
+        statement = (
+            select(FormResponse)
+            .where(FormResponse.id.in_(ids))  # type: ignore
+            .options(defer(FormResponse.raw_payload))  # type: ignore
+        )
+        responses = session.exec(statement).all()
+
+        return [
+            (
+                response.id,  # type: ignore
+                report_filename(response.id, response.email),  # type: ignore
+                registry.resolve_key(response.form_id),
+                build_replacements(response),
+            )
+            for response in responses
+        ]
+
+
+def iter_render_jobs(
+    filters: ExportFilters, chunk_size: Optional[int] = None
+) -> Iterator[RenderJob]:
+    """
+    Jobs de todas as respostas que passam nos filtros, bloco a bloco.
+
+    Os ids vêm da mesma paginação por keyset da exportação; cada bloco vira
+    jobs só quando o anterior foi consumido, então a memória não depende do
+    tamanho da coorte.
+    """
+    id_idx = EXPORT_COLUMNS.index("id")
+    for rows in iter_response_chunks(filters, chunk_size):
+        yield from load_render_jobs(row[id_idx] for row in rows)
+
+
+def iter_rendered_reports_inline(
+    jobs: Iterable[RenderJob],
+) -> Iterator[tuple[int, str, bytes]]:
+    """
+    Renderiza os relatórios um a um, no próprio processo.
+
+    Para a task do Celery: o filho do worker prefork é daemon e não pode abrir
+    um pool de processos; o paralelismo vem do --concurrency do worker bulk.
+    """
+    for job in jobs:
+        yield _render_job(job)
+
+
+def _new_pool(max_workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_render_worker,
+    )
+
+
+def _render_in(
+    pool: ProcessPoolExecutor, jobs: Iterable[RenderJob], max_in_flight: int
+) -> Iterator[tuple[int, str, bytes]]:
+    pending: set[Future] = set()
+    try:
+        for job in jobs:
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(pool.submit(_render_job, job))
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        # Consumidor desistiu (ex: download interrompido): o que ainda não
+        # começou não ocupa o pool
+        for future in pending:
+            future.cancel()
+
+
+def iter_rendered_reports(
+    jobs: Iterable[RenderJob],
+    max_workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+) -> Iterator[tuple[int, str, bytes]]:
+    """
+    Renderiza os relatórios em paralelo num pool de processos próprio.
+
+    Cada filho carrega os templates uma vez no início. No máximo `max_in_flight`
+    jobs ficam pendentes ao mesmo tempo, então a memória não cresce com o
+    tamanho do lote. Os resultados saem na ordem em que ficam prontos.
+
+    Yields:
+        Tuplas (response_id, nome do arquivo, bytes do PDF)
+    """
+    max_workers = max_workers or Config.RENDER_POOL_WORKERS or os.cpu_count() or 1
+    max_in_flight = max_in_flight or max_workers * 2
+
+    with _new_pool(max_workers) as pool:
+        yield from _render_in(pool, jobs, max_in_flight)
+
+
+_shared_pool: Optional[ProcessPoolExecutor] = None
+_shared_pool_lock = threading.Lock()
+
+
+def _get_shared_pool() -> ProcessPoolExecutor:
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = _new_pool(Config.EXPORT_RENDER_WORKERS)
+        return _shared_pool
+
+
+def _discard_shared_pool(pool: ProcessPoolExecutor) -> None:
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is pool:
+            _shared_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_shared_rendered_reports(
+    jobs: Iterable[RenderJob],
+) -> Iterator[tuple[int, str, bytes]]:
+    """
+    Como iter_rendered_reports, mas no pool do processo web: criado no
+    primeiro download e compartilhado pelos downloads simultâneos, com
+    EXPORT_RENDER_WORKERS processos no total (e não um pool por requisição).
+    """
+    pool = _get_shared_pool()
+    try:
+        yield from _render_in(pool, jobs, Config.EXPORT_RENDER_WORKERS * 2)
+    except BrokenProcessPool:
+        # Um filho morreu (ex: OOM): o próximo download cria um pool novo
+        _discard_shared_pool(pool)
+        raise
+
+
+def write_reports(
+    rendered: Iterable[tuple[int, str, bytes]],
+    output_dir: Optional[str] = None,
+    archive_path: Optional[str] = None,
+) -> int:
+    """
+    Grava os relatórios conforme ficam prontos, num diretório ou num ZIP.
+
+    Returns:
+        Quantidade de relatórios gravados
+    """
+    if bool(output_dir) == bool(archive_path):
+        raise ValueError("Informe exatamente um entre output_dir e archive_path")
+
+    count = 0
+    if archive_path:
+        # PDFs já são comprimidos; ZIP_STORED evita gastar CPU à toa
+        with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_STORED) as zf:
+            for _, filename, data in rendered:
+                zf.writestr(filename, data)
+                count += 1
+    else:
+        os.makedirs(output_dir, exist_ok=True)  # type: ignore
+        for _, filename, data in rendered:
+            with open(os.path.join(output_dir, filename), "wb") as f:  # type: ignore
+                f.write(data)
+            count += 1
+
+    return count
+
+
+class ZipStream:
+    """
+    Monta um ZIP em pedaços, à medida que os relatórios ficam prontos.
+
+    O destino não é "seekable": o zipfile grava os tamanhos em data
+    descriptors, e em memória fica só o relatório da vez. Iterar produz os
+    pedaços; `count` tem quantos relatórios já entraram no ZIP.
+    """
+
+    def __init__(self, rendered: Iterable[tuple[int, str, bytes]]) -> None:
+        self.rendered = rendered
+        self.count = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        sink = ChunkSink()
+        # PDFs já são comprimidos; ZIP_STORED evita gastar CPU à toa
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED) as zf:
+            for _, filename, data in self.rendered:
+                zf.writestr(filename, data)
+                self.count += 1
+                yield sink.drain()
+
+        # Diretório central, escrito no close()
+        if data := sink.drain():
+            yield data
+
+
+def stream_zip(rendered: Iterable[tuple[int, str, bytes]]) -> ZipStream:
+    """ZIP em streaming dos relatórios (ver ZipStream)."""
+    return ZipStream(rendered)
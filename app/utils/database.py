@@ -1,13 +1,104 @@
+from typing import Any
+
+from sqlalchemy import event, inspect
 from sqlmodel import SQLModel, create_engine
 
 from app.config import Config
 
-engine = create_engine(Config.DATABASE_URL, echo=True)
+# Modo de nó único (ver README): WAL deixa leituras do processo web rodarem
+# junto com a escrita de uma task; synchronous=NORMAL é seguro em WAL (perde
+# no máximo as últimas transações numa queda de energia, sem corromper)
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": "5000",
+    "foreign_keys": "ON",
+    "temp_store": "MEMORY",
+    "cache_size": "-65536",  # KB (64 MB)
+    "mmap_size": "268435456",
+}
+
+
+def _engine_options(url: str) -> dict[str, Any]:
+    if not url.startswith("sqlite"):
+        return {}
+    # Sessões são abertas pelos threads do executor local e do servidor
+    return {"connect_args": {"check_same_thread": False, "timeout": 30}}
+
+
+# Sem echo: os statements saem pelo logger "sqlalchemy.engine" (SQL_ECHO)
+engine = create_engine(Config.DATABASE_URL, **_engine_options(Config.DATABASE_URL))
+
+
+def set_sqlite_pragmas(dbapi_connection: Any, _: Any) -> None:
+    """Listener de "connect": aplica SQLITE_PRAGMAS a cada conexão nova."""
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", set_sqlite_pragmas)
 
 
 def create_db_and_tables():
     """Criar banco de dados e tabelas"""
     # Import all models here to ensure they are registered
-    from app.models import FormResponse  # noqa: F401
+    from app.models import (  # noqa: F401
+        DeadLetter,
+        FormResponse,
+        FormResponsePayload,
+        TaskOutbox,
+    )
 
     SQLModel.metadata.create_all(engine)
+    sync_schema()
+
+
+def sync_schema():
+    """
+    Adiciona colunas e índices novos em tabelas que já existem.
+
+    create_all só cria tabelas inexistentes; sem isso, bancos criados com uma
+    versão anterior dos modelos ficariam sem as colunas/índices novos. Colunas
+    NOT NULL sem server_default são adicionadas como nullable, e colunas que
+    passaram a ser opcionais no modelo perdem o NOT NULL (exceto no SQLite,
+    que não suporta ALTER COLUMN).
+    """
+    inspector = inspect(engine)
+
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing = {
+                column["name"]: column for column in inspector.get_columns(table.name)
+            }
+            for column in table.columns:
+                if column.name in existing:
+                    if (
+                        column.nullable
+                        and not existing[column.name]["nullable"]
+                        and engine.dialect.name != "sqlite"
+                    ):
+                        conn.exec_driver_sql(
+                            f'ALTER TABLE "{table.name}" '
+                            f'ALTER COLUMN "{column.name}" DROP NOT NULL'
+                        )
+                    continue
+
+                ddl = (
+                    f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" '
+                    f"{column.type.compile(dialect=engine.dialect)}"
+                )
+                if column.server_default is not None:
+                    default = column.server_default.arg  # type: ignore
+                    ddl += f" DEFAULT {getattr(default, 'text', default)}"
+                    if not column.nullable:
+                        ddl += " NOT NULL"
+                conn.exec_driver_sql(ddl)
+
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from app.celery_app import LANES, LIVE_QUEUE, celery
+from app.config import Config
+
+# Tasks são enfileiradas pelo nome: o processo web não importa app.tasks
+# (PyMuPDF, smtplib/ssl e todo o pipeline ficam só no worker).
+PROCESS_FORM_RESPONSE = "process_form_response"
+
+
+def enqueue_task(
+    task_name: str,
+    *args: Any,
+    lane: str = LIVE_QUEUE,
+    kwargs: dict[str, Any] | None = None,
+    **options: Any,
+) -> None:
+    """
+    Enfileira uma task do worker pelo nome.
+
+    Args:
+        lane: "live" (submissões novas) ou "bulk" (reprocessamentos em massa);
+            ignorada com TASK_EXECUTOR=local
+        kwargs: argumentos nomeados da task
+    """
+    if lane not in LANES:
+        raise ValueError(f"Fila inválida: {lane}")
+    if Config.TASK_EXECUTOR == "local":
+        # Modo de nó único: sem broker, a fila é o pool de threads local
+        from app.utils.local_executor import submit
+
+        submit(task_name, list(args), kwargs, countdown=options.get("countdown"))
+        return
+    # send_task não conhece o task_ignore_result da task (só o nome) e, sem
+    # isso, assina no Redis o canal de resultado de cada task enviada
+    options.setdefault("ignore_result", celery.conf.task_ignore_result)
+    celery.send_task(task_name, args=list(args), kwargs=kwargs, queue=lane, **options)
+
+
+def enqueue_form_response(
+    response_id: int,
+    lane: str = LIVE_QUEUE,
+    generation: Optional[int] = None,
+    **options: Any,
+) -> None:
+    """
+    Enfileira o pipeline completo (scores, PDF, email) de uma resposta.
+
+    O horário do enfileiramento vai junto na mensagem e é gravado pelo worker
+    em FormResponse.enqueued_at, sem uma escrita extra no banco aqui.
+
+    Args:
+        generation: FormResponse.generation que motivou a execução; se outro
+            reenvio chegar antes, a execução desiste. Sem ela, vale a geração
+            lida pelo worker ao começar.
+    """
+    kwargs: dict[str, Any] = {"enqueued_at": datetime.utcnow().isoformat()}
+    if generation is not None:
+        kwargs["generation"] = generation
+
+    enqueue_task(
+        PROCESS_FORM_RESPONSE,
+        response_id,
+        lane=lane,
+        kwargs=kwargs,
+        **options,
+    )
@@ -0,0 +1,275 @@
+import csv
+import io
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import tuple_
+from sqlmodel import Session, select
+
+from app.config import Config
+from app.models.form_response import FormResponse
+from app.utils.database import engine
+
+# Colunas exportadas (o raw_payload fica de fora de propósito)
+EXPORT_COLUMNS = (
+    "id",
+    "email",
+    "name",
+    "tally_response_id",
+    "submitted_at",
+    "score_agilidade",
+    "score_agressividade",
+    "score_atencao_detalhes",
+    "score_enfase_recompensas",
+    "score_estabilidade",
+    "score_informalidade",
+    "score_orientacao_resultados",
+    "score_trabalho_equipe",
+    "scoring_model_version",
+    "processed",
+    "pdf_generated",
+    "email_sent",
+    "error_message",
+    "created_at",
+    "updated_at",
+)
+
+# Tipo de cada coluna exportada no Parquet; toda coluna de EXPORT_COLUMNS
+# precisa estar aqui
+PARQUET_TYPES = {
+    "id": "int",
+    "email": "str",
+    "name": "str",
+    "tally_response_id": "str",
+    "submitted_at": "datetime",
+    **{name: "float" for name in EXPORT_COLUMNS if name.startswith("score_")},
+    "scoring_model_version": "str",
+    "processed": "bool",
+    "pdf_generated": "bool",
+    "email_sent": "bool",
+    "error_message": "str",
+    "created_at": "datetime",
+    "updated_at": "datetime",
+}
+# Checado no import: uma coluna nova sem tipo quebraria só a exportação
+# Parquet, e só em produção (pyarrow é opcional)
+if set(PARQUET_TYPES) != set(EXPORT_COLUMNS):
+    raise RuntimeError("PARQUET_TYPES não corresponde a EXPORT_COLUMNS")
+
+EXPORT_FORMATS = ("csv", "parquet")
+
+_TRUE_VALUES = ("true", "1", "yes", "sim")
+_FALSE_VALUES = ("false", "0", "no", "nao", "não")
+
+
+@dataclass
+class ExportFilters:
+    """Filtros aplicados na exportação de FormResponse."""
+
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    processed: Optional[bool] = None
+    email_sent: Optional[bool] = None
+    form_id: Optional[str] = None
+
+    @classmethod
+    def from_params(cls, params: Mapping[str, Any]) -> "ExportFilters":
+        """Constrói filtros a partir de query string / argumentos de CLI."""
+        return cls(
+            created_from=parse_datetime(params.get("from")),
+            created_to=parse_datetime(params.get("to")),
+            processed=parse_bool(params.get("processed")),
+            email_sent=parse_bool(params.get("email_sent")),
+            form_id=params.get("form_id") or None,
+        )
+
+
+def parse_bool(value: Any) -> Optional[bool]:
+    """Converte "true"/"false" (e variações) em bool; vazio vira None."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        return value
+    lowered = str(value).strip().lower()
+    if lowered in _TRUE_VALUES:
+        return True
+    if lowered in _FALSE_VALUES:
+        return False
+    raise ValueError(f"Valor booleano inválido: {value}")
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """Converte data ISO 8601 (ex: 2025-03-01 ou 2025-03-01T12:00) em datetime."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        raise ValueError(f"Data inválida: {value}") from None
+
+
+def iter_response_chunks(
+    filters: ExportFilters, chunk_size: Optional[int] = None
+) -> Iterator[list[tuple]]:
+    """
+    Itera sobre FormResponse em blocos usando paginação por keyset em
+    (created_at, id), servida pelo índice ix_formresponse_created_at_id.
+
+    Cada bloco é lido em uma sessão curta, então a memória fica constante e
+    nenhuma transação longa é mantida aberta durante o streaming.
+
+    Yields:
+        Listas de tuplas na ordem de EXPORT_COLUMNS
+    """
+    chunk_size = chunk_size or Config.EXPORT_CHUNK_SIZE
+    columns = [getattr(FormResponse, name) for name in EXPORT_COLUMNS]
+    created_at_idx = EXPORT_COLUMNS.index("created_at")
+    id_idx = EXPORT_COLUMNS.index("id")
+
+    base = select(*columns)
+    if filters.created_from is not None:
+        base = base.where(FormResponse.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        base = base.where(FormResponse.created_at < filters.created_to)
+    if filters.processed is not None:
+        base = base.where(FormResponse.processed == filters.processed)
+    if filters.email_sent is not None:
+        base = base.where(FormResponse.email_sent == filters.email_sent)
+    if filters.form_id is not None:
+        base = base.where(FormResponse.form_id == filters.form_id)
+    base = base.order_by(FormResponse.created_at, FormResponse.id).limit(chunk_size)
+
+    last_key: Optional[tuple[datetime, int]] = None
+    while True:
+        statement = base
+        if last_key is not None:
+            statement = statement.where(
+                tuple_(FormResponse.created_at, FormResponse.id) > tuple_(*last_key)
+            )
+
+        with Session(engine) as session:
+            rows = [tuple(row) for row in session.exec(statement).all()]
+
+        if not rows:
+            return
+
+        yield rows
+
+        if len(rows) < chunk_size:
+            return
+        last_key = (rows[-1][created_at_idx], rows[-1][id_idx])
+
+
+def stream_csv(chunks: Iterator[list[tuple]]) -> Iterator[str]:
+    """Serializa os blocos em CSV, um pedaço de texto por bloco."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+
+    for rows in chunks:
+        writer.writerows(
+            [
+                [
+                    value.isoformat() if isinstance(value, datetime) else value
+                    for value in row
+                ]
+                for row in rows
+            ]
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+class ChunkSink(io.RawIOBase):
+    """Arquivo somente-escrita que acumula bytes até serem drenados."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self._buffer.extend(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def require_pyarrow() -> None:
+    """
+    Garante que o pyarrow (extra "export") está instalado.
+
+    Chamado antes de começar a resposta: dentro do gerador, a falta dele só
+    apareceria com o download já iniciado.
+
+    Raises:
+        RuntimeError: com a instrução de instalação
+    """
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise RuntimeError(
+            "Exportação Parquet requer pyarrow (pip install 'inspercodenapratica[export]')"
+        ) from None
+
+
+def stream_parquet(chunks: Iterator[list[tuple]]) -> Iterator[bytes]:
+    """
+    Serializa os blocos em Parquet, um row group por bloco.
+
+    Requer pyarrow (extra "export"; ver require_pyarrow).
+    """
+    require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {
+        "int": pa.int64(),
+        "str": pa.string(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "datetime": pa.timestamp("us"),
+    }
+    schema = pa.schema([(name, types[PARQUET_TYPES[name]]) for name in EXPORT_COLUMNS])
+    # Um campo a menos deslocaria os tipos de todas as colunas seguintes
+    if len(schema) != len(EXPORT_COLUMNS):
+        raise RuntimeError("Schema Parquet não corresponde a EXPORT_COLUMNS")
+
+    sink = ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for rows in chunks:
+            columns = list(zip(*rows))
+            batch = pa.record_batch(
+                [
+                    pa.array(col, type=schema.field(i).type)
+                    for i, col in enumerate(columns)
+                ],
+                schema=schema,
+            )
+            writer.write_batch(batch)
+            if data := sink.drain():
+                yield data
+    finally:
+        writer.close()
+
+    if data := sink.drain():
+        yield data
@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Assinatura usada para detectar mudanças no arquivo
+_Signature = tuple[int, int]  # (mtime_ns, size)
+
+
+def _file_signature(path: str) -> Optional[_Signature]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ReloadingFileCache(Generic[T]):
+    """
+    Cache em memória, por processo, de arquivos já parseados.
+
+    Cada arquivo é lido e parseado uma vez (`loader(path, data)`). Uma thread
+    daemon verifica a cada `poll_interval` segundos se algum arquivo mudou e,
+    nesse caso, recarrega e troca a entrada de forma atômica. Quem chama
+    `get()` nunca toca no disco depois da primeira carga.
+
+    Após um fork (workers do Celery/gunicorn) a thread é recriada no filho na
+    próxima chamada, e as entradas já carregadas no pai continuam válidas.
+    """
+
+    def __init__(
+        self, loader: Callable[[str, bytes], T], poll_interval: float = 5.0
+    ) -> None:
+        self._loader = loader
+        self._poll_interval = poll_interval
+        self._entries: dict[str, tuple[_Signature, T]] = {}
+        self._lock = threading.Lock()
+        self._watcher_pid: Optional[int] = None
+        # O lock pode estar preso no momento do fork; o filho recebe um novo
+        os.register_at_fork(after_in_child=self._reset_lock)
+
+    def _reset_lock(self) -> None:
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> T:
+        """Retorna o conteúdo parseado do arquivo, carregando na primeira vez."""
+        self._ensure_watcher()
+
+        entry = self._entries.get(path)
+        if entry is not None:
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                entry = self._load(path)
+                self._entries[path] = entry
+        return entry[1]
+
+    def _load(self, path: str) -> tuple[_Signature, T]:
+        with open(path, "rb") as f:
+            data = f.read()
+        signature = _file_signature(path) or (0, len(data))
+        return signature, self._loader(path, data)
+
+    def reload_changed(self) -> list[str]:
+        """Recarrega os arquivos que mudaram desde a última carga."""
+        reloaded = []
+        for path, (signature, _) in list(self._entries.items()):
+            current = _file_signature(path)
+            if current is None or current == signature:
+                # Arquivo removido: mantém a última versão válida em memória
+                continue
+            try:
+                entry = self._load(path)
+            except Exception:
+                # Arquivo sendo escrito ou inválido: tenta no próximo ciclo
+                continue
+            with self._lock:
+                self._entries[path] = entry
+            reloaded.append(path)
+        return reloaded
+
+    def _ensure_watcher(self) -> None:
+        if self._poll_interval <= 0 or self._watcher_pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._watcher_pid == os.getpid():
+                return
+            self._watcher_pid = os.getpid()
+            thread = threading.Thread(
+                target=self._watch, name="reloading-file-cache", daemon=True
+            )
+            thread.start()
+
+    def _watch(self) -> None:
+        pid = os.getpid()
+        while True:
+            time.sleep(self._poll_interval)
+            if self._watcher_pid != pid:
+                return
+            self.reload_changed()
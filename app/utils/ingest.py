@@ -0,0 +1,121 @@
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import ValidationError
+
+from app.config import Config
+from app.models.form_response import FormResponse
+from app.utils.tally_payload import TallyData, TallyWebhook
+
+
+class InvalidSubmission(ValueError):
+    """Payload do webhook sem os dados mínimos (resposta 400)."""
+
+
+def parse_submission(body: bytes) -> tuple[str, str, TallyData]:
+    """
+    Valida o corpo do webhook do Tally, direto dos bytes.
+
+    Returns:
+        Tupla (nome, email, dados do evento)
+
+    Raises:
+        InvalidSubmission: com a mensagem devolvida ao Tally
+    """
+    if not body.strip():
+        raise InvalidSubmission("Payload vazio")
+
+    try:
+        webhook = TallyWebhook.model_validate_json(body)
+    except ValidationError as e:
+        error = e.errors(include_url=False)[0]
+        location = ".".join(str(part) for part in error["loc"])
+        raise InvalidSubmission(
+            f"Payload inválido: {location or 'corpo'}: {error['msg']}"
+        ) from None
+
+    if webhook.data is None:
+        raise InvalidSubmission("Payload vazio")
+
+    name, email = webhook.data.contact()
+    if not email:
+        raise InvalidSubmission("Email não encontrado no payload")
+    if not name:
+        raise InvalidSubmission("Nome não encontrado no payload")
+
+    return name, email, webhook.data
+
+
+def new_response(
+    name: str,
+    email: str,
+    body: bytes,
+    data: TallyData,
+    received_at: datetime,
+) -> FormResponse:
+    """FormResponse da primeira submissão de um email."""
+    return FormResponse(
+        email=email,
+        name=name,
+        raw_payload=body.decode("utf-8"),
+        attribute_values=json.dumps(data.attribute_values()),
+        tally_response_id=data.response_id,
+        form_id=data.form_id,
+        received_at=received_at,
+    )
+
+
+def apply_resubmission(
+    existing: FormResponse,
+    name: str,
+    body: bytes,
+    data: TallyData,
+    received_at: datetime,
+) -> None:
+    """
+    Atualiza o FormResponse de um email que enviou o formulário de novo:
+    troca o payload, reinicia trilha de latência e flags e avança a geração.
+    """
+    existing.name = name
+    existing.raw_payload = body.decode("utf-8")
+    existing.attribute_values = json.dumps(data.attribute_values())
+    existing.tally_response_id = data.response_id
+    existing.form_id = data.form_id
+    existing.submitted_at = received_at
+    existing.updated_at = received_at
+    # Reiniciar a trilha de latência
+    existing.received_at = received_at
+    existing.enqueued_at = None
+    existing.scoring_started_at = None
+    existing.scoring_finished_at = None
+    existing.pdf_finished_at = None
+    existing.email_accepted_at = None
+    # Resetar flags de processamento
+    existing.processed = False
+    existing.pdf_generated = False
+    existing.email_sent = False
+    existing.error_message = None
+    # Incremento no próprio UPDATE: reenvios simultâneos não perdem geração
+    existing.generation = FormResponse.generation + 1  # type: ignore
+
+
+def coalesce_countdown(resubmission: bool) -> Optional[int]:
+    """Espera antes de processar: só reenvios, dentro da janela de coalescência."""
+    if resubmission and Config.RESUBMISSION_COALESCE_SECONDS > 0:
+        return Config.RESUBMISSION_COALESCE_SECONDS
+    return None
+
+
+def too_large_body() -> dict[str, Any]:
+    """Corpo da resposta 413 (corpo acima de MAX_CONTENT_LENGTH)."""
+    return {"error": f"Payload maior que {Config.MAX_CONTENT_LENGTH} bytes"}
+
+
+def accepted_body(response_id: int) -> dict[str, Any]:
+    """Corpo da resposta 202 do webhook."""
+    return {
+        "status": "success",
+        "message": "Webhook recebido e processamento iniciado",
+        "response_id": response_id,
+    }
@@ -0,0 +1,123 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from billiard.einfo import ExceptionInfo, ExceptionWithTraceback
+from celery.app.trace import build_tracer
+from celery.exceptions import Retry
+
+from app.celery_app import celery
+from app.config import Config
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+_started = False
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=Config.LOCAL_EXECUTOR_WORKERS,
+                thread_name_prefix="local-task",
+            )
+        return _pool
+
+
+def _load_tasks() -> None:
+    # Registra as tasks no app do Celery (PyMuPDF, smtplib...) fora do boot
+    import app.tasks  # noqa: F401
+
+
+def _run(task_name: str, args: list[Any], kwargs: dict[str, Any], retries: int):
+    """
+    Executa a task no thread atual, como o worker do Celery faria.
+
+    Usa o tracer do Celery (sinais, self.request, self.retry) no modo eager;
+    uma retentativa volta para o executor respeitando o countdown, em vez de
+    rodar na hora como em Task.apply(). Falhas já são logadas pelo tracer.
+    """
+    _load_tasks()
+    task = celery.tasks[task_name]
+    task_id = str(uuid.uuid4())
+    request = {
+        "id": task_id,
+        "args": args,
+        "kwargs": kwargs,
+        "retries": retries,
+        "is_eager": True,
+        "delivery_info": {"is_eager": True},
+        "ignore_result": True,
+    }
+    tracer = build_tracer(task.name, task, eager=True, propagate=False, app=celery)
+    retval = tracer(task_id, args, kwargs, request).retval
+
+    if isinstance(retval, ExceptionInfo):
+        retval = retval.exception
+        if isinstance(retval, ExceptionWithTraceback):
+            retval = retval.exc
+    if isinstance(retval, Retry) and retval.sig is not None:
+        submit(
+            task_name,
+            list(retval.sig.args),
+            dict(retval.sig.kwargs),
+            countdown=retval.sig.options.get("countdown"),
+            retries=retries + 1,
+        )
+
+
+def submit(
+    task_name: str,
+    args: list[Any],
+    kwargs: Optional[dict[str, Any]] = None,
+    countdown: Optional[float] = None,
+    retries: int = 0,
+) -> None:
+    """
+    Agenda uma task no pool de threads do processo (TASK_EXECUTOR=local).
+
+    Não há fila persistente: tasks pendentes se perdem se o processo cair, e
+    o sweeper (agendado por start()) as reenfileira a partir do banco.
+    """
+    job = (task_name, args, kwargs or {}, retries)
+    if countdown:
+        timer = threading.Timer(countdown, _get_pool().submit, (_run, *job))
+        timer.daemon = True
+        timer.start()
+    else:
+        _get_pool().submit(_run, *job)
+
+
+def _schedule_periodic(task_name: str, interval: float) -> None:
+    def tick() -> None:
+        submit(task_name, [])
+        _schedule_periodic(task_name, interval)
+
+    timer = threading.Timer(interval, tick)
+    timer.daemon = True
+    timer.start()
+
+
+def start() -> None:
+    """
+    Sobe o executor local: carrega as tasks em segundo plano (sem atrasar o
+    boot do processo web), inicia o relay do outbox e agenda as tasks
+    periódicas do beat_schedule.
+    """
+    global _started
+    with _pool_lock:
+        if _started:
+            return
+        _started = True
+
+    _get_pool().submit(_load_tasks)
+
+    # Relay do outbox (o webhook grava as tasks no banco, ver app.utils.outbox)
+    from app.utils.outbox import run_relay
+
+    threading.Thread(target=run_relay, name="outbox-relay", daemon=True).start()
+
+    for entry in celery.conf.beat_schedule.values():
+        _schedule_periodic(entry["task"], float(entry["schedule"]))
@@ -0,0 +1,150 @@
+import atexit
+import contextlib
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from collections.abc import Iterator
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
+
+from app.config import Config
+
+# Submissão em processamento no contexto atual (request do webhook ou task)
+response_id_var: ContextVar[Optional[int]] = ContextVar("response_id", default=None)
+
+# Atributos padrão de um LogRecord; o resto veio de `extra=` e vai para o JSON
+_RECORD_ATTRS = frozenset(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {
+    "message",
+    "response_id",
+}
+
+_lock = threading.Lock()
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+
+
+@contextlib.contextmanager
+def bound_response_id(response_id: Optional[int]) -> Iterator[None]:
+    """Associa os logs do bloco a uma submissão."""
+    token = response_id_var.set(response_id)
+    try:
+        yield
+    finally:
+        response_id_var.reset(token)
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro, com response_id e os campos de `extra=`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        document: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        response_id = getattr(record, "response_id", None)
+        if response_id is not None:
+            document["response_id"] = response_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                document[key] = value
+        if record.exc_text:
+            document["exc"] = record.exc_text
+        return json.dumps(document, ensure_ascii=False, default=str)
+
+
+class DebugSampler(logging.Filter):
+    """Deixa passar só uma fração dos registros DEBUG; os demais níveis passam."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or random.random() < self.rate
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Enfileira o registro para o thread do QueueListener.
+
+    No thread de quem loga fica só o mínimo: capturar o response_id, montar a
+    mensagem e, se houver exceção, o traceback (que não atravessa a fila).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.response_id = response_id_var.get()
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+def _start_listener() -> None:
+    global _listener
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(JsonFormatter())
+    _listener = QueueListener(_queue, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_listener_in_child() -> None:
+    # O thread do listener não sobrevive ao fork (workers do Celery e do
+    # gunicorn, pool de renderização): sem isso a fila do filho só cresceria
+    global _listener, _queue
+    if _listener is None:
+        return
+    _queue = queue.SimpleQueue()
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, ContextQueueHandler):
+            handler.queue = _queue
+    _start_listener()
+
+
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
+
+
+def configure_logging() -> None:
+    """
+    Configura o logging do processo (web ou worker); chamadas repetidas não
+    fazem nada.
+
+    Todos os loggers (app, SQLAlchemy, SMTP de app.tasks.email_sender)
+    vão para a raiz, cujo único handler só enfileira; a escrita em stderr, em
+    JSON, acontece no thread do QueueListener.
+    """
+    with _lock:
+        if _listener is not None:
+            return
+
+        handler = ContextQueueHandler(_queue)
+        handler.addFilter(DebugSampler(Config.LOG_DEBUG_SAMPLE_RATE))
+
+        root = logging.getLogger()
+        root.handlers = [handler]
+        root.setLevel(Config.LOG_LEVEL)
+
+        # SQL só quando pedido: com echo=True o SQLAlchemy escrevia cada
+        # statement direto no stdout
+        logging.getLogger("sqlalchemy.engine").setLevel(
+            logging.INFO if Config.SQL_ECHO else logging.WARNING
+        )
+
+        _start_listener()
+        atexit.register(_stop_listener)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_restart_listener_in_child)
@@ -0,0 +1,60 @@
+import logging
+import os
+import resource
+import tracemalloc
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_kb() -> int:
+    """
+    RSS atual do processo em KB.
+
+    Lê /proc/self/statm (Linux); fora do Linux cai no pico (ru_maxrss).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class StageTracer:
+    """
+    Diferenças de alocação (tracemalloc) entre etapas de uma task.
+
+    Só faz algo se o tracemalloc estiver ativo (ver MEMORY_TRACE_TOP_N).
+    Memória alocada em C (ex: MuPDF) não aparece aqui, só no RSS.
+    """
+
+    def __init__(self, label: str, top_n: int) -> None:
+        self._label = label
+        self._top_n = top_n
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        if top_n > 0 and tracemalloc.is_tracing():
+            self._snapshot = self._take()
+
+    @staticmethod
+    def _take() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+
+    def checkpoint(self, stage: str) -> None:
+        """Registra no log o top-N de crescimento desde o checkpoint anterior."""
+        if self._snapshot is None:
+            return
+
+        snapshot = self._take()
+        stats = snapshot.compare_to(self._snapshot, "lineno")[: self._top_n]
+        self._snapshot = snapshot
+
+        logger.info(
+            "tracemalloc %s [%s]:\n%s",
+            self._label,
+            stage,
+            "\n".join(f"  {stat}" for stat in stats),
+        )
@@ -0,0 +1,242 @@
+import json
+import logging
+import select as select_module
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import delete, event, text
+from sqlmodel import Session, select
+
+from app.celery_app import LIVE_QUEUE, celery
+from app.config import Config
+from app.models.task_outbox import TaskOutbox
+from app.utils.database import engine
+from app.utils.dispatch import PROCESS_FORM_RESPONSE, enqueue_task
+
+logger = logging.getLogger(__name__)
+
+# Canal do LISTEN/NOTIFY do Postgres que acorda o relay
+NOTIFY_CHANNEL = "task_outbox"
+NOTIFY_STATEMENT = text(f"NOTIFY {NOTIFY_CHANNEL}")
+
+# Com TASK_EXECUTOR=local o relay roda num thread do próprio processo
+_local_wakeup = threading.Event()
+
+
+def outbox_entry(
+    task_name: str,
+    *args: Any,
+    lane: str = LIVE_QUEUE,
+    kwargs: Optional[dict[str, Any]] = None,
+    countdown: Optional[float] = None,
+) -> TaskOutbox:
+    """Entrada do outbox de uma task (ainda não adicionada a uma sessão)."""
+    eta = None
+    if countdown:
+        eta = datetime.utcnow() + timedelta(seconds=countdown)
+    return TaskOutbox(
+        task_name=task_name,
+        args=json.dumps(list(args)),
+        kwargs=json.dumps(kwargs or {}),
+        lane=lane,
+        eta=eta,
+    )
+
+
+def form_response_entry(
+    response_id: int,
+    lane: str = LIVE_QUEUE,
+    generation: Optional[int] = None,
+    countdown: Optional[float] = None,
+) -> TaskOutbox:
+    """Entrada do outbox equivalente a enqueue_form_response."""
+    kwargs = {} if generation is None else {"generation": generation}
+    return outbox_entry(
+        PROCESS_FORM_RESPONSE,
+        response_id,
+        lane=lane,
+        kwargs=kwargs,
+        countdown=countdown,
+    )
+
+
+def stage_entry(session: Session, entry: TaskOutbox) -> None:
+    """
+    Grava a entrada no outbox, na transação da sessão.
+
+    Só vale se o commit acontecer, e o commit não espera o broker: o relay
+    (outbox_relay.py) publica depois.
+    """
+    session.add(entry)
+
+    # O relay acorda no commit, sem esperar a próxima varredura
+    if Config.TASK_EXECUTOR == "local":
+        event.listen(session, "after_commit", lambda _: _local_wakeup.set(), once=True)
+    elif engine.dialect.name == "postgresql":
+        # Entregue pelo Postgres só no commit
+        session.exec(NOTIFY_STATEMENT)  # type: ignore
+
+
+def stage_task(session: Session, task_name: str, *args: Any, **options: Any) -> None:
+    """Grava no outbox a intenção de enfileirar uma task (ver outbox_entry)."""
+    stage_entry(session, outbox_entry(task_name, *args, **options))
+
+
+def stage_form_response(
+    session: Session,
+    response_id: int,
+    lane: str = LIVE_QUEUE,
+    generation: Optional[int] = None,
+    countdown: Optional[float] = None,
+) -> None:
+    """Equivalente transacional de enqueue_form_response."""
+    stage_entry(session, form_response_entry(response_id, lane, generation, countdown))
+
+
+def _publish(entries: list[TaskOutbox]) -> None:
+    enqueued_at = datetime.utcnow().isoformat()
+    messages = []
+    for entry in entries:
+        kwargs = json.loads(entry.kwargs)
+        if entry.task_name == PROCESS_FORM_RESPONSE:
+            kwargs["enqueued_at"] = enqueued_at
+        options = {}
+        if entry.eta is not None:
+            options["eta"] = entry.eta.replace(tzinfo=timezone.utc)
+        messages.append((entry, kwargs, options))
+
+    if Config.TASK_EXECUTOR == "local":
+        for entry, kwargs, options in messages:
+            eta = options.get("eta")
+            countdown = (
+                max(0.0, (eta - datetime.now(timezone.utc)).total_seconds())
+                if eta
+                else None
+            )
+            enqueue_task(
+                entry.task_name,
+                *json.loads(entry.args),
+                lane=entry.lane,
+                kwargs=kwargs,
+                countdown=countdown,
+            )
+        return
+
+    # Um producer (e uma conexão) para o lote inteiro
+    with celery.producer_or_acquire() as producer:
+        for entry, kwargs, options in messages:
+            enqueue_task(
+                entry.task_name,
+                *json.loads(entry.args),
+                lane=entry.lane,
+                kwargs=kwargs,
+                producer=producer,
+                **options,
+            )
+
+
+def relay_batch(batch_size: Optional[int] = None) -> int:
+    """
+    Publica um lote do outbox e remove as entradas publicadas.
+
+    As linhas ficam travadas (FOR UPDATE SKIP LOCKED) até o commit, então
+    vários relays podem rodar juntos. Se o broker falhar, a transação é
+    desfeita e o lote volta na próxima rodada; se o processo cair entre a
+    publicação e o commit, o lote é publicado de novo (at-least-once; o
+    worker descarta execuções de gerações antigas).
+
+    Returns:
+        Quantidade de tasks publicadas
+    """
+    batch_size = batch_size or Config.OUTBOX_BATCH_SIZE
+
+    with Session(engine) as session:
+        statement = (
+            select(TaskOutbox)
+            .order_by(TaskOutbox.id)  # type: ignore
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        entries = list(session.exec(statement).all())
+        if not entries:
+            return 0
+
+        _publish(entries)
+        session.exec(
+            delete(TaskOutbox).where(
+                TaskOutbox.id.in_([entry.id for entry in entries])  # type: ignore
+            )
+        )
+        session.commit()
+
+    return len(entries)
+
+
+def wait_for_entries(timeout: float) -> None:
+    """
+    Espera até chegar uma notificação do outbox (Postgres) ou o timeout.
+
+    Em outros bancos só dorme: o relay volta a varrer a cada `timeout`.
+    """
+    if Config.TASK_EXECUTOR == "local":
+        if _local_wakeup.wait(timeout):
+            _local_wakeup.clear()
+        return
+    if engine.dialect.name != "postgresql":
+        time.sleep(timeout)
+        return
+
+    connection = _listen_connection()
+    if select_module.select([connection], [], [], timeout)[0]:
+        connection.poll()
+        connection.notifies.clear()
+
+
+# Conexão do pool reservada para o LISTEN enquanto o relay roda
+_listener: Any = None
+
+
+def _listen_connection() -> Any:
+    global _listener
+    if _listener is None or _listener.driver_connection.closed:
+        _listener = engine.raw_connection()
+        connection = _listener.driver_connection
+        # Em autocommit: dentro de uma transação o LISTEN só valeria no commit
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+    return _listener.driver_connection
+
+
+def run_relay(
+    batch_size: Optional[int] = None,
+    poll_interval: Optional[float] = None,
+    once: bool = False,
+) -> None:
+    """
+    Laço do relay: publica lotes cheios em sequência e, com o outbox vazio,
+    espera uma notificação ou `poll_interval`.
+
+    Args:
+        once: esvazia o outbox e retorna
+    """
+    batch_size = batch_size or Config.OUTBOX_BATCH_SIZE
+    poll_interval = poll_interval or Config.OUTBOX_POLL_INTERVAL_SECONDS
+
+    while True:
+        try:
+            while relay_batch(batch_size) == batch_size:
+                pass
+        except Exception:
+            # Broker ou banco fora: o lote continua no outbox
+            logger.exception("Falha ao publicar o outbox")
+            if once:
+                raise
+            time.sleep(poll_interval)
+            continue
+
+        if once:
+            return
+        wait_for_entries(poll_interval)
@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import zstandard
+from sqlmodel import Session, func, select, update
+
+from app.config import Config
+from app.models.form_response import FormResponse
+from app.models.form_response_payload import FormResponsePayload
+from app.utils.database import engine
+
+
+@dataclass
+class ArchiveStats:
+    """Resultado de um lote de arquivamento."""
+
+    rows: int = 0
+    original_bytes: int = 0
+    compressed_bytes: int = 0
+
+
+def decompress_payload(data: bytes) -> str:
+    """Descomprime um payload arquivado."""
+    return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+
+
+def load_raw_payload(session: Session, response: FormResponse) -> str:
+    """
+    Payload JSON do webhook, venha ele da tabela quente ou do arquivo.
+
+    Só consulta FormResponsePayload quando o payload já foi arquivado.
+    """
+    if response.raw_payload is not None:
+        return response.raw_payload
+
+    archived = session.get(FormResponsePayload, response.id)
+    if archived is None:
+        raise ValueError(f"Payload de {response.id} não encontrado")
+    return decompress_payload(archived.data)
+
+
+def archive_batch(older_than: datetime, batch_size: int) -> ArchiveStats:
+    """
+    Move para FormResponsePayload os payloads de um lote de respostas já
+    entregues (processed e email_sent) sem atualização desde `older_than`.
+
+    As linhas ficam travadas até o commit (FOR UPDATE SKIP LOCKED no
+    PostgreSQL), então um reenvio do formulário no meio do lote espera o
+    arquivamento terminar e grava o payload novo por cima do NULL.
+    """
+    stats = ArchiveStats()
+    compressor = zstandard.ZstdCompressor(level=Config.PAYLOAD_ZSTD_LEVEL)
+
+    with Session(engine) as session:
+        statement = (
+            select(FormResponse.id, FormResponse.raw_payload)
+            .where(FormResponse.raw_payload.is_not(None))  # type: ignore
+            .where(FormResponse.processed)
+            .where(FormResponse.email_sent)
+            .where(FormResponse.updated_at < older_than)
+            .order_by(FormResponse.id)  # type: ignore
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        rows = session.exec(statement).all()
+        if not rows:
+            return stats
+
+        for response_id, raw_payload in rows:
+            original = raw_payload.encode("utf-8")  # type: ignore
+            data = compressor.compress(original)
+            # merge: sobrescreve um arquivo antigo se a resposta foi reenviada
+            session.merge(
+                FormResponsePayload(
+                    response_id=response_id,  # type: ignore
+                    data=data,
+                    original_size=len(original),
+                    compressed_size=len(data),
+                )
+            )
+            stats.rows += 1
+            stats.original_bytes += len(original)
+            stats.compressed_bytes += len(data)
+
+        session.exec(
+            update(FormResponse)
+            .where(FormResponse.id.in_([row[0] for row in rows]))  # type: ignore
+            .values(raw_payload=None)
+        )  # type: ignore
+        session.commit()
+
+    return stats
+
+
+def space_report() -> dict[str, Any]:
+    """Espaço ocupado pelos payloads na tabela quente e no arquivo."""
+    length = func.octet_length if engine.dialect.name == "postgresql" else func.length
+
+    with Session(engine) as session:
+        hot_rows, hot_bytes = session.exec(
+            select(
+                func.count(),
+                func.coalesce(func.sum(length(FormResponse.raw_payload)), 0),
+            ).where(FormResponse.raw_payload.is_not(None))  # type: ignore
+        ).one()
+        archived_rows, original_bytes, compressed_bytes = session.exec(
+            select(
+                func.count(),
+                func.coalesce(func.sum(FormResponsePayload.original_size), 0),
+                func.coalesce(func.sum(FormResponsePayload.compressed_size), 0),
+            )
+        ).one()
+
+        report = {
+            "hot_rows": hot_rows,
+            "hot_payload_bytes": hot_bytes,
+            "archived_rows": archived_rows,
+            "archived_original_bytes": original_bytes,
+            "archived_compressed_bytes": compressed_bytes,
+            "saved_bytes": original_bytes - compressed_bytes,
+        }
+
+        if engine.dialect.name == "postgresql":
+            # Inclui TOAST e índices; só diminui depois de VACUUM FULL/pg_repack
+            for table in ("formresponse", "formresponsepayload"):
+                report[f"{table}_total_bytes"] = session.exec(
+                    select(func.pg_total_relation_size(table))
+                ).one()
+
+    return report
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Optional
+
+from app.config import Config
+from app.models.form_response import FormResponse
+
+PREVIEW_FORMATS = ("png", "pdf")
+MIN_DPI, MAX_DPI = 36, 200
+
+# Chaves aceitas em "scores" (colunas score_* do FormResponse, sem o prefixo)
+SCORE_FIELDS = tuple(
+    name.removeprefix("score_")
+    for name in FormResponse.model_fields
+    if name.startswith("score_")
+)
+
+
+class LRUCache:
+    """Cache LRU em memória, limitado por número de entradas e por bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: bytes) -> None:
+        if len(value) > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = value
+            self._size += len(value)
+            while (
+                len(self._entries) > self._max_entries or self._size > self._max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+_cache = LRUCache(Config.PREVIEW_CACHE_MAX_ENTRIES, Config.PREVIEW_CACHE_MAX_BYTES)
+
+
+def response_from_scores(data: Mapping[str, Any]) -> FormResponse:
+    """
+    Monta um FormResponse (não persistido) a partir de scores informados.
+
+    Formato: {"scores": {"agilidade": 7.5, ...}, "name": ..., "email": ...,
+    "form_id": ...}. Scores ausentes ficam 0.
+    """
+    scores = data.get("scores") or {}
+    if not isinstance(scores, dict):
+        raise ValueError("'scores' deve ser um objeto")
+
+    unknown = set(scores) - set(SCORE_FIELDS)
+    if unknown:
+        raise ValueError(f"Scores desconhecidos: {', '.join(sorted(unknown))}")
+
+    values = {}
+    for key, value in scores.items():
+        # bool é subclasse de int: true/false não são scores
+        if (
+            isinstance(value, bool)
+            or not isinstance(value, (int, float))
+            or not 0 <= value <= 10
+        ):
+            raise ValueError(f"Score inválido para {key}: deve estar entre 0 e 10")
+        values[f"score_{key}"] = float(value)
+
+    return FormResponse(
+        name=str(data.get("name") or "Nome do Participante"),
+        email=str(data.get("email") or "participante@example.com"),
+        form_id=data.get("form_id"),
+        tally_response_id="preview",
+        **values,
+    )
+
+
+def render_preview(
+    response: FormResponse, output_format: str, page: int = 1, dpi: int = 72
+) -> tuple[bytes, str, bool]:
+    """
+    Renderiza o relatório (PDF completo ou PNG de uma página), com cache.
+
+    A chave do cache combina as substituições geradas, a versão do template
+    (muda a cada alteração do arquivo) e os parâmetros de saída.
+
+    Returns:
+        Tupla (conteúdo, chave/ETag, se veio do cache)
+    """
+    # Importado aqui: o processo web só carrega PyMuPDF se houver preview
+    from app.utils.rendering import (
+        apply_replacements,
+        build_replacements,
+        render_report,
+    )
+    from app.utils.template_registry import get_template
+
+    if output_format not in PREVIEW_FORMATS:
+        raise ValueError(f"Formato inválido: {output_format}")
+
+    template = get_template(response.form_id)
+    if not 1 <= page <= template.page_count:
+        raise ValueError(f"Página inválida: 1 a {template.page_count}")
+    dpi = min(max(dpi, MIN_DPI), MAX_DPI)
+
+    replacements = build_replacements(response)
+    key = hashlib.sha256(
+        json.dumps(
+            [replacements, template.version, output_format, page, dpi],
+            sort_keys=True,
+        ).encode("utf-8")
+    ).hexdigest()
+
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached, key, True
+
+    if output_format == "pdf":
+        # Sem subset de fontes: o preview não vai para o email
+        content = render_report(template.data, replacements, "default")
+    else:
+        import fitz
+
+        doc = fitz.open("pdf", template.data)
+        try:
+            # Só a página pedida recebe as substituições
+            doc.select([page - 1])
+            apply_replacements(doc, replacements)
+            content = doc[0].get_pixmap(dpi=dpi).tobytes("png")
+        finally:
+            doc.close()
+
+    _cache.put(key, content)
+    return content, key, False
@@ -0,0 +1,273 @@
+from datetime import datetime
+from typing import Any, Optional, TypedDict
+
+import fitz
+
+from app.config import Config
+from app.models.form_response import FormResponse
+
+
+class ReplacementConfig(TypedDict):
+    """Configuração de substituição de texto no PDF."""
+
+    text: str
+    fontname: str
+    fontsize: int
+    color: tuple[float, float, float]
+    align: int
+    expand_right: float
+    expand_down: float
+
+
+# Constantes
+GRAY_COLOR = (0.26, 0.26, 0.26)
+BLACK_COLOR = (0, 0, 0)
+
+NIVEL_THRESHOLDS = {
+    "BAIXO": (0, 3.5),
+    "MÉDIO": (3.5, 7.0),
+    "ALTO": (7.0, 10.0),
+}
+
+FONT_CONFIGS = {
+    "titulo": {
+        "fontname": "hebo",
+        "fontsize": 20,
+        "color": BLACK_COLOR,
+        "expand_right": 200,  # Expandir para direita
+        "expand_down": 0,
+    },
+    "subtitulo": {
+        "fontname": "helv",
+        "fontsize": 18,
+        "color": BLACK_COLOR,
+        "expand_right": 200,  # Expandir para direita
+        "expand_down": 0,
+    },
+    "score": {
+        "fontname": "hebo",
+        "fontsize": 42,
+        "color": GRAY_COLOR,
+        "expand_right": 0,
+        "expand_down": 0,
+    },
+    "nivel": {
+        "fontname": "helv",
+        "fontsize": 16,
+        "color": GRAY_COLOR,
+        "expand_right": 0,
+        "expand_down": 0,
+    },
+    "descritivo": {
+        "fontname": "helv",
+        "fontsize": 11,  # Reduzido de 12 para 11
+        "color": GRAY_COLOR,
+        "expand_right": 150,  # Expandir bastante para direita
+        "expand_down": 30,  # Expandir para baixo para quebra de linha
+    },
+}
+
+
+# Perfis de saída do PDF (Config.PDF_OUTPUT_PROFILE).
+# "default" mantém o comportamento original; "compact" remove objetos órfãos
+# deixados pelas redações, comprime streams/imagens/fontes, usa object streams
+# e faz subset das fontes embutidas. Ver benchmarks/bench_pdf_profiles.py.
+PDF_OUTPUT_PROFILES: dict[str, dict[str, Any]] = {
+    "default": {"subset_fonts": False, "save": {}},
+    "compact": {
+        "subset_fonts": True,
+        "save": {
+            "garbage": 3,
+            "deflate": True,
+            "deflate_images": True,
+            "deflate_fonts": True,
+            "use_objstms": 1,
+        },
+    },
+    "max": {
+        "subset_fonts": True,
+        "save": {
+            "garbage": 4,
+            "clean": True,
+            "deflate": True,
+            "deflate_images": True,
+            "deflate_fonts": True,
+            "use_objstms": 1,
+        },
+    },
+}
+
+
+def get_nivel(score: float) -> str:
+    """Determina o nível baseado no score (0-10)."""
+    for nivel, (min_val, max_val) in NIVEL_THRESHOLDS.items():
+        if min_val <= score < max_val:
+            return nivel
+    return "ALTO"
+
+
+def get_descritivo(categoria: str, score: float) -> str:
+    """Retorna texto descritivo baseado no score da categoria."""
+    nivel = get_nivel(score)
+    categoria_formatada = categoria.lower()
+
+    descritivos = {
+        "ALTO": f"Você apresenta forte preferência por ambientes com alta {categoria_formatada}.",
+        "MÉDIO": f"Você apresenta preferência moderada por ambientes com {categoria_formatada}.",
+        "BAIXO": f"Você apresenta baixa preferência por ambientes com {categoria_formatada}.",
+    }
+
+    return descritivos[nivel]
+
+
+def create_replacement(
+    text: str, config_type: str, align: int = fitz.TEXT_ALIGN_LEFT
+) -> ReplacementConfig:
+    """Cria configuração de substituição baseada no tipo."""
+    config = FONT_CONFIGS[config_type].copy()
+    config["text"] = text
+    config["align"] = align
+    return config  # type: ignore
+
+
+def build_replacements(response: FormResponse) -> dict[str, ReplacementConfig]:
+    """Constrói dicionário de substituições a partir do FormResponse."""
+    data_atual = datetime.now().strftime("%d/%m/%Y")
+
+    # Mapeamento de scores
+    scores = {
+        "agilidade": response.score_agilidade or 0,
+        "agressividade": response.score_agressividade or 0,
+        "atencao_detalhes": response.score_atencao_detalhes or 0,
+        "enfase_recompensas": response.score_enfase_recompensas or 0,
+        "estabilidade": response.score_estabilidade or 0,
+        "informalidade": response.score_informalidade or 0,
+        "orientacao_resultados": response.score_orientacao_resultados or 0,
+        "trabalho_equipe": response.score_trabalho_equipe or 0,
+    }
+
+    replacements = {
+        # Cabeçalho
+        "{{nome}}": create_replacement(response.name, "titulo"),
+        "{{email}}": create_replacement(response.email, "subtitulo"),
+        "{{data}}": create_replacement(data_atual, "subtitulo"),
+    }
+
+    # Configuração das categorias com placeholders corretos
+    categorias = [
+        ("agilidade", "agilidade", "{{DESCRITIVO-AGILIDADE}}"),
+        ("agressividade", "agressividade", "{{DESCRITIVO-AGRESSIVIDADE}}"),
+        ("atencao_detalhes", "atenção a detalhes", "{{DESCRITIVO-ATENCAO-DETALHES}}"),
+        (
+            "enfase_recompensas",
+            "ênfase em recompensa",
+            "{{DESCRITIVO-ENFASE-RECOMPENSA}}",
+        ),
+        ("estabilidade", "estabilidade", "{{DESCRITIVO-ESTABILIDADE}}"),
+        ("informalidade", "informalidade", "{{DESCRITIVO-INFORMALIDADE}}"),
+        (
+            "orientacao_resultados",
+            "orientação para resultado",
+            "{{DESCRITIVO-ORIENTACAO-RESULTADO}}",
+        ),
+        ("trabalho_equipe", "trabalho em equipe", "{{TRABALHO-EQUIPE}}"),
+    ]
+
+    for idx, (key, nome_categoria, placeholder_descritivo) in enumerate(
+        categorias, start=1
+    ):
+        score = scores[key]
+
+        # Score numérico
+        replacements[f"{{{idx}}}"] = create_replacement(
+            f"{score:.1f}", "score", fitz.TEXT_ALIGN_CENTER
+        )
+
+        # Nível
+        replacements[f"{{{{nivel{idx}}}}}"] = create_replacement(
+            get_nivel(score), "nivel", fitz.TEXT_ALIGN_CENTER
+        )
+
+        # Descritivo
+        replacements[placeholder_descritivo] = create_replacement(
+            get_descritivo(nome_categoria, score), "descritivo"
+        )
+
+    return replacements
+
+
+def apply_replacements(
+    doc: fitz.Document, replacements: dict[str, ReplacementConfig]
+) -> None:
+    """Aplica substituições em todas as páginas do documento."""
+    for page in doc:
+        for placeholder, config in replacements.items():
+            text_instances = page.search_for(placeholder)
+
+            for inst in text_instances:
+                # Expandir retângulo apenas para direita e para baixo
+                expanded_rect = fitz.Rect(
+                    inst.x0,  # Mantém a posição esquerda
+                    inst.y0,  # Mantém a posição superior
+                    inst.x1 + config["expand_right"],  # Expande para direita
+                    inst.y1 + config["expand_down"],  # Expande para baixo
+                )
+
+                # Adicionar redação com área expandida
+                page.add_redact_annot(
+                    expanded_rect,
+                    text=config["text"],
+                    fontname=config["fontname"],
+                    fontsize=config["fontsize"],
+                    text_color=config["color"],
+                    align=config["align"],
+                )
+
+        # Os placeholders não ficam sobre imagens; com o padrão (PIXELS) o
+        # MuPDF processa as imagens da página a cada redação e o RSS do worker
+        # cresce ~160 KB por relatório (ver benchmarks/soak_render.py)
+        page.apply_redactions(images=fitz.PDF_REDACT_IMAGE_NONE)
+
+
+def report_filename(response_id: int, email: str) -> str:
+    """Nome do arquivo do relatório de uma resposta."""
+    return f"relatorio_{response_id}_{email.replace('@', '_')}.pdf"
+
+
+def prepare_output(doc: fitz.Document, profile: Optional[str] = None) -> dict:
+    """
+    Aplica o perfil de saída no documento e retorna as opções de save.
+
+    Args:
+        doc: Documento já com as substituições aplicadas
+        profile: Nome do perfil (padrão: Config.PDF_OUTPUT_PROFILE)
+
+    Returns:
+        kwargs para doc.save() / doc.tobytes()
+    """
+    profile = profile or Config.PDF_OUTPUT_PROFILE
+    if profile not in PDF_OUTPUT_PROFILES:
+        raise ValueError(f"Perfil de saída de PDF inválido: {profile}")
+
+    options = PDF_OUTPUT_PROFILES[profile]
+    if options["subset_fonts"]:
+        doc.subset_fonts()
+    return options["save"]
+
+
+def render_report(
+    template_bytes: bytes,
+    replacements: dict[str, ReplacementConfig],
+    profile: Optional[str] = None,
+) -> bytes:
+    """
+    Renderiza o relatório em memória a partir dos bytes do template.
+
+    Não acessa banco nem disco, então pode rodar em processos filhos.
+    """
+    doc = fitz.open("pdf", template_bytes)
+    try:
+        apply_replacements(doc, replacements)
+        return doc.tobytes(**prepare_output(doc, profile))
+    finally:
+        doc.close()
@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+from app.config import Config
+
+_TOKEN_SALT = "report-download"
+
+
+def check_link_config() -> None:
+    """
+    Falha na inicialização (web e worker) se o modo link estiver ativo sem
+    REPORT_LINK_SECRET.
+
+    O token só carrega o response_id, que é sequencial: assinado com uma
+    chave conhecida, qualquer um geraria links para todos os relatórios.
+    """
+    if Config.REPORT_DELIVERY_MODE == "link" and not Config.REPORT_LINK_SECRET:
+        raise RuntimeError("REPORT_DELIVERY_MODE=link requer REPORT_LINK_SECRET")
+
+
+def _serializer() -> URLSafeTimedSerializer:
+    if not Config.REPORT_LINK_SECRET:
+        raise RuntimeError("REPORT_LINK_SECRET não configurado")
+    return URLSafeTimedSerializer(Config.REPORT_LINK_SECRET, salt=_TOKEN_SALT)
+
+
+def stored_report_path(response_id: int) -> str:
+    """Caminho do relatório armazenado de uma resposta."""
+    return os.path.join(Config.REPORT_STORAGE_DIR, f"relatorio_{response_id}.pdf")
+
+
+def store_report(response_id: int, pdf_path: str) -> str:
+    """
+    Move o PDF gerado para o armazenamento de relatórios.
+
+    A troca é atômica (arquivo temporário + os.replace), então um download em
+    andamento nunca vê um arquivo pela metade.
+
+    Returns:
+        Caminho final do relatório
+    """
+    os.makedirs(Config.REPORT_STORAGE_DIR, exist_ok=True)
+    destination = stored_report_path(response_id)
+
+    fd, tmp_path = tempfile.mkstemp(dir=Config.REPORT_STORAGE_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.move(pdf_path, tmp_path)
+        os.replace(tmp_path, destination)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return destination
+
+
+def build_download_url(response_id: int) -> str:
+    """Gera a URL assinada de download do relatório."""
+    token = _serializer().dumps({"r": response_id})
+    return f"{Config.DOMAIN}/api/v1/reports/{token}"
+
+
+def resolve_download_token(token: str) -> int:
+    """
+    Valida o token de download e retorna o response_id.
+
+    Raises:
+        itsdangerous.SignatureExpired: token expirado
+        itsdangerous.BadSignature: token inválido
+    """
+    if not Config.REPORT_LINK_SECRET:
+        # Sem chave nenhum link foi emitido
+        raise BadSignature("REPORT_LINK_SECRET não configurado")
+
+    data = _serializer().loads(token, max_age=Config.REPORT_LINK_TTL_SECONDS)
+    return int(data["r"])
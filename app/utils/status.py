@@ -0,0 +1,247 @@
+import json
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from functools import cache
+from typing import Any, Optional
+
+import redis
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Etapas do processamento de uma submissão, na ordem
+STAGES = (
+    "received",
+    "scoring",
+    "scored",
+    "pdf_generated",
+    "email_sent",
+    "retrying",
+    "error",
+)
+TERMINAL_STAGES = frozenset({"email_sent", "error"})
+
+
+@cache
+def _redis() -> redis.Redis:
+    # O pool do redis-py detecta fork e recria as conexões no processo filho
+    return redis.Redis.from_url(
+        Config.REDIS_URL,
+        decode_responses=True,
+        socket_connect_timeout=2,
+        socket_timeout=5,
+    )
+
+
+class MemoryStatusStore:
+    """
+    Status em memória, para o modo de nó único (STATUS_BACKEND=memory).
+
+    Só serve quando web e tasks rodam no mesmo processo (TASK_EXECUTOR=local).
+    Quem espera atualizações acorda por uma Condition em vez do pub/sub.
+    """
+
+    def __init__(self) -> None:
+        self._changed = threading.Condition()
+        # chave -> (documento, expira em, versão)
+        self._entries: dict[str, tuple[str, float, int]] = {}
+        self._version = 0
+
+    def get(self, key: str) -> tuple[Optional[str], int]:
+        """Documento atual e sua versão (0 se não houver)."""
+        with self._changed:
+            return self._get(key)
+
+    def _get(self, key: str) -> tuple[Optional[str], int]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, 0
+        if entry[1] < time.monotonic():
+            del self._entries[key]
+            return None, 0
+        return entry[0], entry[2]
+
+    def set(self, key: str, document: str, ttl: int, nx: bool = False) -> None:
+        with self._changed:
+            if nx and self._get(key)[0] is not None:
+                return
+            self._version += 1
+            self._entries[key] = (document, time.monotonic() + ttl, self._version)
+            self._changed.notify_all()
+
+    def wait(self, key: str, version: int, timeout: float) -> tuple[Optional[str], int]:
+        """Espera a chave mudar em relação a `version` (ou o timeout)."""
+        with self._changed:
+            self._changed.wait_for(lambda: self._get(key)[1] != version, timeout)
+            return self._get(key)
+
+
+_memory = MemoryStatusStore() if Config.STATUS_BACKEND == "memory" else None
+
+
+@cache
+def _async_redis() -> "redis.asyncio.Redis":
+    import redis.asyncio
+
+    return redis.asyncio.Redis.from_url(
+        Config.REDIS_URL,
+        decode_responses=True,
+        socket_connect_timeout=2,
+        socket_timeout=5,
+    )
+
+
+def _key(response_id: int) -> str:
+    return f"response-status:{response_id}"
+
+
+def _document(response_id: int, stage: str, **extra: Any) -> dict[str, Any]:
+    return {
+        "response_id": response_id,
+        "stage": stage,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        **extra,
+    }
+
+
+def publish_status(response_id: int, stage: str, **extra: Any) -> None:
+    """
+    Registra a etapa atual da submissão no Redis e avisa quem estiver
+    esperando (pub/sub). Falhas são só logadas: o status é informativo e não
+    pode derrubar o pipeline.
+    """
+    document = json.dumps(_document(response_id, stage, **extra))
+    if _memory is not None:
+        _memory.set(_key(response_id), document, Config.STATUS_TTL_SECONDS)
+        return
+
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        pipe.set(_key(response_id), document, ex=Config.STATUS_TTL_SECONDS)
+        pipe.publish(_key(response_id), document)
+        pipe.execute()
+    except redis.RedisError:
+        logger.warning("Falha ao publicar status de %s", response_id, exc_info=True)
+
+
+async def apublish_status(response_id: int, stage: str, **extra: Any) -> None:
+    """publish_status para o servidor ASGI (app.asgi), sem bloquear o loop."""
+    document = json.dumps(_document(response_id, stage, **extra))
+    if _memory is not None:
+        _memory.set(_key(response_id), document, Config.STATUS_TTL_SECONDS)
+        return
+
+    try:
+        async with _async_redis().pipeline(transaction=False) as pipe:
+            pipe.set(_key(response_id), document, ex=Config.STATUS_TTL_SECONDS)
+            pipe.publish(_key(response_id), document)
+            await pipe.execute()
+    except redis.RedisError:
+        logger.warning("Falha ao publicar status de %s", response_id, exc_info=True)
+
+
+def get_cached_status(response_id: int) -> Optional[dict[str, Any]]:
+    """Status atual a partir do Redis (None se não houver)."""
+    if _memory is not None:
+        document, _ = _memory.get(_key(response_id))
+    else:
+        document = _redis().get(_key(response_id))
+    return json.loads(document) if document else None  # type: ignore
+
+
+def cache_status(response_id: int, stage: str) -> dict[str, Any]:
+    """
+    Guarda no Redis um status reconstruído do banco, sem sobrescrever um
+    status mais novo publicado pelo worker nesse meio tempo.
+    """
+    document = _document(response_id, stage)
+    if _memory is not None:
+        _memory.set(
+            _key(response_id), json.dumps(document), Config.STATUS_TTL_SECONDS, nx=True
+        )
+    else:
+        _redis().set(
+            _key(response_id),
+            json.dumps(document),
+            ex=Config.STATUS_TTL_SECONDS,
+            nx=True,
+        )
+    return get_cached_status(response_id) or document
+
+
+def stage_from_flags(
+    processed: bool, pdf_generated: bool, email_sent: bool, error_message: Optional[str]
+) -> str:
+    """Deriva a etapa a partir das flags do FormResponse."""
+    if email_sent:
+        return "email_sent"
+    if error_message:
+        return "error"
+    if pdf_generated:
+        return "pdf_generated"
+    if processed:
+        return "scored"
+    return "received"
+
+
+def iter_status_updates(
+    response_id: int, timeout: float
+) -> Iterator[Optional[dict[str, Any]]]:
+    """
+    Assina o canal da submissão e produz cada novo status publicado.
+
+    O primeiro item é o status em cache lido logo após a assinatura, para não
+    perder uma publicação que aconteça entre a consulta inicial e a espera.
+    Depois produz None a cada segundo sem mensagens (útil para heartbeat) e
+    termina após `timeout` segundos ou numa etapa final.
+    """
+    if _memory is not None:
+        yield from _iter_memory_updates(response_id, timeout)
+        return
+
+    pubsub = _redis().pubsub(ignore_subscribe_messages=True)
+    try:
+        pubsub.subscribe(_key(response_id))
+        yield get_cached_status(response_id)
+
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            message = pubsub.get_message(timeout=min(1.0, remaining))
+            if message is None:
+                yield None
+                continue
+
+            status = json.loads(message["data"])
+            yield status
+            if status["stage"] in TERMINAL_STAGES:
+                return
+    finally:
+        pubsub.close()
+
+
+def _iter_memory_updates(
+    response_id: int, timeout: float
+) -> Iterator[Optional[dict[str, Any]]]:
+    """iter_status_updates para o MemoryStatusStore (mesmo contrato)."""
+    assert _memory is not None
+    key = _key(response_id)
+    document, version = _memory.get(key)
+    yield json.loads(document) if document else None
+
+    deadline = time.monotonic() + timeout
+    while (remaining := deadline - time.monotonic()) > 0:
+        changed, new_version = _memory.wait(key, version, min(1.0, remaining))
+        if new_version == version or changed is None:
+            version = new_version
+            yield None
+            continue
+
+        version = new_version
+        status = json.loads(changed)
+        yield status
+        if status["stage"] in TERMINAL_STAGES:
+            return
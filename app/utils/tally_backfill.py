@@ -0,0 +1,203 @@
+import asyncio
+import json
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+import httpx
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from app.models.form_response import FormResponse
+from app.utils.database import engine
+from app.utils.dispatch import enqueue_form_response
+from app.utils.tally_payload import TallyData, submission_to_payload
+
+# Respostas 429/5xx são retentadas algumas vezes antes de desistir
+MAX_ATTEMPTS = 5
+INSERT_BATCH_SIZE = 500
+
+
+@dataclass
+class BackfillStats:
+    """Resumo de uma importação."""
+
+    fetched: int = 0
+    already_present: int = 0
+    invalid: int = 0
+    inserted: int = 0
+    conflicts: int = 0  # email já cadastrado por outra submissão
+    inserted_ids: list[int] = field(default_factory=list)
+
+
+async def _get_page(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    form_id: str,
+    page: int,
+    limit: int,
+) -> dict[str, Any]:
+    params = {"page": page, "limit": limit, "filter": "completed"}
+
+    async with semaphore:
+        for attempt in range(MAX_ATTEMPTS):
+            response = await client.get(f"/forms/{form_id}/submissions", params=params)
+            if response.status_code != 429 and response.status_code < 500:
+                break
+            if attempt == MAX_ATTEMPTS - 1:
+                break
+            retry_after = response.headers.get("Retry-After", "")
+            await asyncio.sleep(
+                float(retry_after) if retry_after.isdigit() else 2**attempt
+            )
+
+    response.raise_for_status()
+    return response.json()
+
+
+async def fetch_submissions(
+    form_id: str,
+    api_key: str,
+    base_url: str,
+    concurrency: int = 4,
+    page_size: int = 100,
+) -> tuple[list[dict[str, Any]], dict[str, dict[str, Any]]]:
+    """
+    Baixa todas as submissões completas de um formulário.
+
+    A primeira página informa o total; as demais são buscadas em paralelo,
+    com no máximo `concurrency` requisições abertas. Se chegarem submissões
+    novas durante a busca, as páginas seguintes são lidas em sequência.
+
+    Returns:
+        Tupla (submissões sem repetição, perguntas por id)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    headers = {"Authorization": f"Bearer {api_key}"}
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        headers=headers,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=concurrency),
+    ) as client:
+        first = await _get_page(client, semaphore, form_id, 1, page_size)
+        total = first["totalNumberOfSubmissionsPerFilter"]["completed"]
+        last_page = max(1, math.ceil(total / first["limit"]))
+
+        pages = [first] + list(
+            await asyncio.gather(
+                *(
+                    _get_page(client, semaphore, form_id, page, first["limit"])
+                    for page in range(2, last_page + 1)
+                )
+            )
+        )
+        while pages[-1]["hasMore"]:
+            pages.append(
+                await _get_page(
+                    client, semaphore, form_id, len(pages) + 1, first["limit"]
+                )
+            )
+
+    questions = {q["id"]: q for page in pages for q in page.get("questions", [])}
+    # Paginação por offset: itens podem se repetir entre páginas
+    submissions = {s["id"]: s for page in pages for s in page["submissions"]}
+    return list(submissions.values()), questions
+
+
+def _existing_tally_ids(session: Session, ids: list[str]) -> set[str]:
+    existing: set[str] = set()
+    for start in range(0, len(ids), INSERT_BATCH_SIZE):
+        chunk = ids[start : start + INSERT_BATCH_SIZE]
+        statement = select(FormResponse.tally_response_id).where(
+            FormResponse.tally_response_id.in_(chunk)  # type: ignore
+        )
+        existing.update(session.exec(statement).all())
+    return existing
+
+
+def _parse_submitted_at(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _insert(rows: list[dict[str, Any]]):
+    dialect = postgresql if engine.dialect.name == "postgresql" else sqlite
+    return (
+        dialect.insert(FormResponse)
+        .values(rows)
+        # Sem alvo: ignora conflito tanto no email quanto no tally_response_id
+        .on_conflict_do_nothing()
+        .returning(FormResponse.id)  # type: ignore
+    )
+
+
+def import_submissions(
+    submissions: list[dict[str, Any]],
+    questions: dict[str, dict[str, Any]],
+    lane: str,
+    dry_run: bool = False,
+) -> BackfillStats:
+    """
+    Grava as submissões que ainda não estão no banco e enfileira cada uma.
+
+    Ids já presentes em tally_response_id são pulados. Se o mesmo email
+    aparece mais de uma vez, vale a submissão mais recente; um email já
+    cadastrado (ex: reenvio recebido pelo webhook) não é sobrescrito.
+    """
+    stats = BackfillStats(fetched=len(submissions))
+
+    with Session(engine) as session:
+        existing = _existing_tally_ids(session, [s["id"] for s in submissions])
+    stats.already_present = len(existing)
+
+    latest_by_email: dict[str, dict[str, Any]] = {}
+    for submission in sorted(submissions, key=lambda s: s["submittedAt"]):
+        if submission["id"] in existing:
+            continue
+
+        payload = submission_to_payload(submission, questions)
+        data = TallyData.model_validate(payload["data"])
+        name, email = data.contact()
+        if not name or not email:
+            stats.invalid += 1
+            continue
+
+        now = datetime.utcnow()
+        latest_by_email[email] = {
+            "email": email,
+            "name": name,
+            "raw_payload": json.dumps(payload),
+            "attribute_values": json.dumps(data.attribute_values()),
+            "tally_response_id": submission["id"],
+            "form_id": submission.get("formId"),
+            "submitted_at": _parse_submitted_at(submission["submittedAt"]),
+            "processed": False,
+            "pdf_generated": False,
+            "email_sent": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    rows = list(latest_by_email.values())
+    if dry_run:
+        stats.inserted = len(rows)
+        return stats
+
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        batch = rows[start : start + INSERT_BATCH_SIZE]
+        with Session(engine) as session:
+            inserted_ids = list(session.exec(_insert(batch)).scalars())  # type: ignore
+            session.commit()
+
+        for response_id in inserted_ids:
+            enqueue_form_response(response_id, lane=lane)
+        stats.inserted += len(inserted_ids)
+        stats.conflicts += len(batch) - len(inserted_ids)
+        stats.inserted_ids.extend(inserted_ids)
+
+    return stats
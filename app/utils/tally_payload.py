@@ -0,0 +1,177 @@
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+# Limites do payload validados no recebimento; um formulário real tem dezenas
+# de campos (o tamanho total do corpo é limitado por MAX_CONTENT_LENGTH)
+MAX_FIELDS = 500
+MAX_OPTIONS = 200
+MAX_LABEL_LENGTH = 2000
+
+
+class TallyOption(BaseModel):
+    """Opção de um campo de escolha (CHECKBOXES, RANKING...)."""
+
+    id: str
+    text: str = ""
+
+
+class TallyField(BaseModel):
+    """Campo respondido; `value` varia com o tipo (texto, lista de ids, bool)."""
+
+    key: str = ""
+    label: Optional[str] = Field(default=None, max_length=MAX_LABEL_LENGTH)
+    type: str = ""
+    value: Any = None
+    options: list[TallyOption] = Field(default_factory=list, max_length=MAX_OPTIONS)
+
+
+class TallyData(BaseModel):
+    """Conteúdo de `data` no evento FORM_RESPONSE."""
+
+    response_id: str = Field(default="", alias="responseId")
+    form_id: Optional[str] = Field(default=None, alias="formId")
+    fields: list[TallyField] = Field(default_factory=list, max_length=MAX_FIELDS)
+
+    def contact(self) -> tuple[str, str]:
+        """
+        Busca nome e email nos campos.
+
+        Returns:
+            Tupla (nome, email); vazios se não encontrados
+        """
+        name = ""
+        email = ""
+        for field in self.fields:
+            label = (field.label or "").lower()
+            value = field.value if isinstance(field.value, str) else ""
+            if "nome" in label:
+                name = value
+            elif "e-mail" in label or "email" in label:
+                email = value
+        return name, email
+
+    def attribute_values(self) -> dict[str, float]:
+        """
+        Valores dos atributos respondidos, pelo texto da opção (ainda sem a
+        normalização do modelo de pontuação): 1 para os MAIS importantes, 0
+        para os MENOS importantes e a posição (1-9) no ranking.
+        """
+        values: dict[str, float] = {}
+
+        # Mapear IDs para textos
+        id_to_text: dict[str, str] = {}
+
+        for field in self.fields:
+            label = field.label or ""
+            value = field.value
+
+            if "nome" in label.lower() or "e-mail" in label.lower():
+                continue
+            elif "MAIS importantes" in label and field.type == "CHECKBOXES":
+                # Selecionar 16 MAIS importantes -> valor = 1
+                for option in field.options:
+                    id_to_text[option.id] = option.text
+                selected = value if isinstance(value, list) else []
+                for attr_id in selected:
+                    if attr_id in id_to_text:
+                        values[id_to_text[attr_id]] = 1.0
+            elif "MENOS importantes" in label and field.type == "CHECKBOXES":
+                # Checkbox individual MENOS importante -> valor = 0
+                if "(" in label and ")" in label:
+                    attr_text = label.split("(")[1].split(")")[0]
+                    if value is True:
+                        values[attr_text] = 0.0
+            elif "ranqueie" in label.lower() and field.type == "RANKING":
+                # A ordem na lista É o ranking: posição 0 = rank 1 (MAIS
+                # importante), posição 8 = rank 9 (MENOS importante)
+                for option in field.options:
+                    id_to_text[option.id] = option.text
+
+                if value and isinstance(value, list):
+                    for rank, option_id in enumerate(value, 1):  # 1-based
+                        if option_id in id_to_text:
+                            values[id_to_text[option_id]] = float(rank)
+
+        return values
+
+
+class TallyWebhook(BaseModel):
+    """
+    Evento do webhook do Tally.
+
+    Validado uma vez, direto dos bytes do corpo (model_validate_json), no
+    recebimento; campos desconhecidos são ignorados.
+    """
+
+    event_id: Optional[str] = Field(default=None, alias="eventId")
+    event_type: Optional[str] = Field(default=None, alias="eventType")
+    data: Optional[TallyData] = None
+
+
+def _choice_texts(value: Any) -> list[str]:
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    return [] if value is None else [str(value)]
+
+
+def submission_to_payload(
+    submission: dict[str, Any], questions: dict[str, dict[str, Any]]
+) -> dict[str, Any]:
+    """
+    Converte uma submissão da API (GET /forms/{id}/submissions) no formato do
+    webhook FORM_RESPONSE, que é o que o pipeline espera em raw_payload.
+
+    A API devolve as escolhas pelo texto da opção, então as opções são
+    reconstruídas com id = texto. Em CHECKBOXES também são gerados os campos
+    individuais "<pergunta> (<opção>)" = True, como o webhook envia.
+
+    Args:
+        submission: Item de "submissions" da API
+        questions: Perguntas do formulário por id (item de "questions")
+    """
+    fields: list[dict[str, Any]] = []
+
+    for response in submission.get("responses", []):
+        question = questions.get(response["questionId"], {})
+        label = question.get("title", "")
+        field_type = question.get("type", "")
+        value = response.get("value")
+        field = {
+            "key": f"question_{response['questionId']}",
+            "label": label,
+            "type": field_type,
+            "value": value,
+        }
+
+        if field_type in ("CHECKBOXES", "MULTIPLE_CHOICE", "RANKING"):
+            texts = _choice_texts(value)
+            field["value"] = texts
+            field["options"] = [{"id": text, "text": text} for text in texts]
+
+        fields.append(field)
+
+        if field_type == "CHECKBOXES":
+            fields.extend(
+                {
+                    "key": f"question_{response['questionId']}_{text}",
+                    "label": f"{label} ({text})",
+                    "type": "CHECKBOXES",
+                    "value": True,
+                }
+                for text in _choice_texts(value)
+            )
+
+    return {
+        "eventId": f"backfill-{submission['id']}",
+        "eventType": "FORM_RESPONSE",
+        "createdAt": submission.get("submittedAt"),
+        "data": {
+            "responseId": submission["id"],
+            "submissionId": submission["id"],
+            "respondentId": submission.get("respondentId"),
+            "formId": submission.get("formId"),
+            "createdAt": submission.get("submittedAt"),
+            "fields": fields,
+        },
+    }
@@ -0,0 +1,83 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import fitz
+
+from app.config import Config
+from app.utils.hot_reload import ReloadingFileCache
+
+DEFAULT_TEMPLATE_KEY = "default"
+
+
+@dataclass(frozen=True)
+class ReportTemplate:
+    """Template de relatório carregado em memória."""
+
+    path: str
+    data: bytes
+    version: str  # hash do conteúdo, muda a cada alteração do arquivo
+    page_count: int
+
+
+def _parse_template(path: str, data: bytes) -> ReportTemplate:
+    """Valida o PDF uma única vez na carga."""
+    doc = fitz.open("pdf", data)
+    try:
+        page_count = len(doc)
+    finally:
+        doc.close()
+
+    return ReportTemplate(
+        path=path,
+        data=data,
+        version=hashlib.sha256(data).hexdigest()[:12],
+        page_count=page_count,
+    )
+
+
+class TemplateRegistry:
+    """
+    Registro de templates por formId ou coorte.
+
+    Os bytes de cada template são lidos e validados uma vez por processo e
+    recarregados automaticamente quando o arquivo muda (ver
+    ReloadingFileCache). As tasks renderizam sempre a partir da cópia em
+    memória.
+    """
+
+    def __init__(self, templates: dict[str, str], poll_interval: float) -> None:
+        if DEFAULT_TEMPLATE_KEY not in templates:
+            raise ValueError("REPORT_TEMPLATES precisa de um template 'default'")
+        self._paths = {key: os.path.abspath(path) for key, path in templates.items()}
+        self._cache = ReloadingFileCache(_parse_template, poll_interval)
+
+    def resolve_key(self, key: Optional[str]) -> str:
+        """Retorna a chave registrada para o formId/coorte, ou 'default'."""
+        if key and key in self._paths:
+            return key
+        return DEFAULT_TEMPLATE_KEY
+
+    def get(self, key: Optional[str] = None) -> ReportTemplate:
+        """Template do formId/coorte (cai no 'default' se não houver)."""
+        path = self._paths[self.resolve_key(key)]
+        try:
+            return self._cache.get(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Template não encontrado: {path}") from None
+
+    def preload(self) -> None:
+        """Carrega todos os templates registrados (ex: no início do worker)."""
+        for key in self._paths:
+            self.get(key)
+
+
+registry = TemplateRegistry(
+    Config.REPORT_TEMPLATES, Config.TEMPLATE_RELOAD_INTERVAL_SECONDS
+)
+
+
+def get_template(key: Optional[str] = None) -> ReportTemplate:
+    """Atalho para registry.get()."""
+    return registry.get(key)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Script para arquivar (zstd) os payloads de respostas já entregues"""
+
+import argparse
+from datetime import datetime, timedelta
+
+from app.config import Config
+from app.utils.payload_store import ArchiveStats, archive_batch, space_report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=Config.PAYLOAD_ARCHIVE_AFTER_DAYS,
+        help="Só respostas sem atualização há mais de N dias",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=Config.PAYLOAD_ARCHIVE_BATCH_SIZE
+    )
+    parser.add_argument(
+        "--max-batches", type=int, default=0, help="Limite de lotes (0 = todos)"
+    )
+    parser.add_argument(
+        "--report", action="store_true", help="Só mostra o relatório de espaço"
+    )
+    return parser.parse_args()
+
+
+def _mb(n: int) -> str:
+    return f"{n / 1024 / 1024:.1f} MB"
+
+
+def print_report() -> None:
+    report = space_report()
+    print(
+        f"[@] Tabela quente: {report['hot_rows']} payloads, "
+        f"{_mb(report['hot_payload_bytes'])}"
+    )
+    print(
+        f"[@] Arquivo: {report['archived_rows']} payloads, "
+        f"{_mb(report['archived_original_bytes'])} -> "
+        f"{_mb(report['archived_compressed_bytes'])} "
+        f"(economia de {_mb(report['saved_bytes'])})"
+    )
+    for table in ("formresponse", "formresponsepayload"):
+        if f"{table}_total_bytes" in report:
+            print(f"[@] {table} no disco: {_mb(report[f'{table}_total_bytes'])}")
+
+
+def main() -> None:
+    args = parse_args()
+
+    if not args.report:
+        older_than = datetime.utcnow() - timedelta(days=args.older_than_days)
+        total = ArchiveStats()
+        batches = 0
+
+        while not args.max_batches or batches < args.max_batches:
+            stats = archive_batch(older_than, args.batch_size)
+            if not stats.rows:
+                break
+            batches += 1
+            total.rows += stats.rows
+            total.original_bytes += stats.original_bytes
+            total.compressed_bytes += stats.compressed_bytes
+            print(
+                f"  lote {batches}: {stats.rows} payloads, "
+                f"{_mb(stats.original_bytes)} -> {_mb(stats.compressed_bytes)}"
+            )
+
+        print(
+            f"[+] {total.rows} payloads arquivados: {_mb(total.original_bytes)} -> "
+            f"{_mb(total.compressed_bytes)}"
+        )
+        if total.rows:
+            print(
+                "[@] O espaço da tabela quente só volta ao disco após "
+                "VACUUM FULL formresponse (ou pg_repack)"
+            )
+
+    print_report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Script para importar submissões antigas de um formulário pela API do Tally"""
+
+import argparse
+import asyncio
+import time
+
+from app.celery_app import BULK_QUEUE, LANES
+from app.config import conf
+from app.utils.tally_backfill import fetch_submissions, import_submissions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("form_id", help="ID do formulário no Tally")
+    parser.add_argument(
+        "--base-url",
+        default=conf.TALLY_API_BASE_URL,
+        help="URL da API (ex: servidor local de testes)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Requisições simultâneas"
+    )
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--lane", choices=LANES, default=BULK_QUEUE)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Só conta, sem gravar nem enfileirar"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    print(f"[@] Buscando submissões do formulário {args.form_id}...")
+    start = time.perf_counter()
+    submissions, questions = asyncio.run(
+        fetch_submissions(
+            args.form_id,
+            conf.TALLY_API_KEY,
+            args.base_url,
+            concurrency=args.concurrency,
+            page_size=args.page_size,
+        )
+    )
+    print(
+        f"[+] {len(submissions)} submissões baixadas em "
+        f"{time.perf_counter() - start:.1f}s"
+    )
+
+    stats = import_submissions(submissions, questions, args.lane, args.dry_run)
+
+    print(f"  Já no banco: {stats.already_present}")
+    print(f"  Sem nome/email: {stats.invalid}")
+    print(f"  Email já cadastrado: {stats.conflicts}")
+    if args.dry_run:
+        print(f"[@] {stats.inserted} submissões seriam importadas")
+    else:
+        print(
+            f"[+] {stats.inserted} submissões importadas e enfileiradas ({args.lane})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Benchmarks (executar a partir da raiz: python -m benchmarks.<nome>)
@@ -0,0 +1,98 @@
+"""
+Benchmark de tamanho e tempo dos perfis de saída do PDF.
+
+Renderiza o mesmo relatório com cada perfil de PDF_OUTPUT_PROFILES e mostra
+o tempo mediano de renderização + save e o tamanho final. Falha (exit 1) se
+o perfil "compact" não for menor que "default" ou se ficar mais lento que
+--max-slowdown vezes o "default".
+
+Uso:
+    python -m benchmarks.bench_pdf_profiles --iterations 10
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from app.models.form_response import FormResponse
+from app.utils.rendering import (
+    PDF_OUTPUT_PROFILES,
+    build_replacements,
+    render_report,
+)
+from app.utils.template_registry import get_template
+
+
+def sample_response() -> FormResponse:
+    return FormResponse(
+        id=1,
+        name="Participante Benchmark da Silva",
+        email="participante.benchmark@example.com",
+        raw_payload="{}",
+        tally_response_id="bench",
+        score_agilidade=8.2,
+        score_agressividade=2.1,
+        score_atencao_detalhes=5.0,
+        score_enfase_recompensas=9.7,
+        score_estabilidade=3.4,
+        score_informalidade=6.6,
+        score_orientacao_resultados=7.1,
+        score_trabalho_equipe=0.5,
+    )
+
+
+def bench_profile(
+    template_bytes: bytes, replacements: dict, profile: str, iterations: int
+) -> tuple[float, int]:
+    timings = []
+    size = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        size = len(render_report(template_bytes, replacements, profile))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), size
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--max-slowdown", type=float, default=1.5)
+    args = parser.parse_args()
+
+    template_bytes = get_template().data
+    replacements = build_replacements(sample_response())
+
+    # Aquecimento (carregamento de fontes, caches do MuPDF)
+    render_report(template_bytes, replacements, "default")
+
+    results = {}
+    print(f"{'perfil':<10} {'tempo (ms)':>12} {'tamanho (KB)':>14} {'vs default':>12}")
+    for profile in PDF_OUTPUT_PROFILES:
+        results[profile] = bench_profile(
+            template_bytes, replacements, profile, args.iterations
+        )
+
+    base_time, base_size = results["default"]
+    for profile, (elapsed, size) in results.items():
+        print(
+            f"{profile:<10} {elapsed * 1000:>12.1f} {size / 1024:>14.1f} "
+            f"{size / base_size:>11.0%}"
+        )
+
+    compact_time, compact_size = results["compact"]
+    failures = []
+    if compact_size >= base_size:
+        failures.append("perfil compact não reduziu o tamanho do PDF")
+    if compact_time > base_time * args.max_slowdown:
+        failures.append(
+            f"perfil compact {compact_time / base_time:.2f}x mais lento que default"
+        )
+
+    for failure in failures:
+        print(f"[!] {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
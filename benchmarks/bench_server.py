@@ -0,0 +1,151 @@
+"""
+Benchmark do perfil do gunicorn (gunicorn.conf.py).
+
+Sobe o gunicorn com o perfil em uma porta local, dispara requisições com
+conexões keep-alive a partir de várias threads por alguns segundos e mostra
+requisições/s, latências e o RSS de cada worker (lido de /proc, Linux).
+
+Por padrão usa /api/v1/health/ready, que não depende de banco nem broker.
+Variáveis GUNICORN_* do ambiente sobrescrevem o perfil (ex: comparar
+GUNICORN_WORKER_CLASS=sync com o padrão gthread).
+
+Uso:
+    python -m benchmarks.bench_server --duration 10 --concurrency 32
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(port: int, path: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", path)
+            if conn.getresponse().status < 500:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("gunicorn não respondeu a tempo")
+
+
+def _rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def _children(pid: int) -> list[int]:
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # pid (comm) state ppid ...
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return children
+
+
+def _load(port: int, path: str, stop_at: float, latencies: list, errors: list):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    local = []
+    while time.monotonic() < stop_at:
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors.append(response.status)
+            if response.getheader("Connection", "").lower() == "close":
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        except OSError as e:
+            errors.append(str(e))
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            continue
+        local.append(time.perf_counter() - start)
+    conn.close()
+    latencies.extend(local)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--path", default="/api/v1/health/ready")
+    args = parser.parse_args()
+
+    port = _free_port()
+    env = {**os.environ, "GUNICORN_BIND": f"127.0.0.1:{port}"}
+    env.setdefault("GUNICORN_ACCESSLOG", "")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        _wait_ready(port, args.path)
+
+        latencies: list[float] = []
+        errors: list = []
+        stop_at = time.monotonic() + args.duration
+        threads = [
+            threading.Thread(
+                target=_load, args=(port, args.path, stop_at, latencies, errors)
+            )
+            for _ in range(args.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        workers = _children(server.pid)
+        master_rss = _rss_kb(server.pid)
+        worker_rss = [_rss_kb(pid) for pid in workers]
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    if not latencies:
+        print("[!] Nenhuma requisição concluída", file=sys.stderr)
+        return 1
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"Requisições: {len(latencies)} ({len(errors)} erros)")
+    print(f"Requisições/s: {len(latencies) / args.duration:.0f}")
+    print(f"Latência p50: {quantiles[49] * 1000:.1f} ms")
+    print(f"Latência p99: {quantiles[98] * 1000:.1f} ms")
+    print(f"RSS master: {master_rss / 1024:.1f} MB")
+    for pid, rss in zip(workers, worker_rss):
+        print(f"RSS worker {pid}: {rss / 1024:.1f} MB")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Servidor local que imita GET /forms/{id}/submissions da API do Tally.
+
+Gera submissões sintéticas (com as perguntas de MAIS/MENOS importantes e o
+ranking que o pipeline pontua), paginadas como a API real, com latência
+opcional por requisição e um 429 a cada N requisições para exercitar os
+retries do backfill_tally.py.
+
+Uso:
+    python -m benchmarks.fake_tally_api --port 8765 --submissions 2000 --latency 0.2
+    python backfill_tally.py meuForm --base-url http://127.0.0.1:8765 --dry-run
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from app.utils.attributes_mapping import CATEGORIES
+
+ATTRIBUTES = sorted({attr for attrs in CATEGORIES.values() for attr in attrs})
+
+QUESTIONS = [
+    {"id": "q_nome", "type": "INPUT_TEXT", "title": "Nome completo"},
+    {"id": "q_email", "type": "INPUT_EMAIL", "title": "E-mail"},
+    {
+        "id": "q_mais",
+        "type": "CHECKBOXES",
+        "title": "Selecione os 16 MAIS importantes",
+    },
+    {
+        "id": "q_menos",
+        "type": "CHECKBOXES",
+        "title": "Selecione os MENOS importantes",
+    },
+    {"id": "q_rank", "type": "RANKING", "title": "Agora ranqueie os atributos"},
+]
+
+
+def build_submissions(form_id: str, count: int, seed: int) -> list[dict]:
+    """Submissões completas, da mais recente para a mais antiga."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    submissions = []
+
+    for i in range(count):
+        shuffled = rng.sample(ATTRIBUTES, len(ATTRIBUTES))
+        submissions.append(
+            {
+                "id": f"{form_id}-sub-{i:06d}",
+                "formId": form_id,
+                "respondentId": f"resp-{i:06d}",
+                "isCompleted": True,
+                "submittedAt": (now - timedelta(minutes=i))
+                .isoformat()
+                .replace("+00:00", "Z"),
+                "responses": [
+                    {"questionId": "q_nome", "value": f"Participante {i}"},
+                    {"questionId": "q_email", "value": f"participante{i}@example.com"},
+                    {"questionId": "q_mais", "value": shuffled[:16]},
+                    {"questionId": "q_menos", "value": shuffled[16:]},
+                    {"questionId": "q_rank", "value": shuffled[:9]},
+                ],
+            }
+        )
+
+    return submissions
+
+
+class FakeTallyHandler(BaseHTTPRequestHandler):
+    submissions: dict[str, list[dict]] = {}
+    count = 0
+    seed = 0
+    latency = 0.0
+    rate_limit_every = 0
+
+    _lock = threading.Lock()
+    _requests = 0
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def _send_json(self, status: int, body: dict, headers: dict | None = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):  # noqa: N802
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "forms" or parts[2] != "submissions":
+            return self._send_json(404, {"message": "Not found"})
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            return self._send_json(401, {"message": "Unauthorized"})
+
+        cls = type(self)
+        with cls._lock:
+            cls._requests += 1
+            throttled = (
+                cls.rate_limit_every and cls._requests % cls.rate_limit_every == 0
+            )
+            if parts[1] not in cls.submissions:
+                cls.submissions[parts[1]] = build_submissions(
+                    parts[1], cls.count, cls.seed
+                )
+        if throttled:
+            return self._send_json(
+                429, {"message": "Too many requests"}, {"Retry-After": "1"}
+            )
+
+        time.sleep(cls.latency)
+
+        query = parse_qs(url.query)
+        page = int(query.get("page", ["1"])[0])
+        limit = min(int(query.get("limit", ["50"])[0]), 500)
+        items = cls.submissions[parts[1]]
+        chunk = items[(page - 1) * limit : page * limit]
+
+        self._send_json(
+            200,
+            {
+                "page": page,
+                "limit": limit,
+                "hasMore": page * limit < len(items),
+                "totalNumberOfSubmissionsPerFilter": {
+                    "all": len(items),
+                    "completed": len(items),
+                    "partial": 0,
+                },
+                "questions": QUESTIONS,
+                "submissions": chunk,
+            },
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--submissions", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Segundos por requisição"
+    )
+    parser.add_argument(
+        "--rate-limit-every", type=int, default=0, help="429 a cada N requisições"
+    )
+    args = parser.parse_args()
+
+    FakeTallyHandler.count = args.submissions
+    FakeTallyHandler.seed = args.seed
+    FakeTallyHandler.latency = args.latency
+    FakeTallyHandler.rate_limit_every = args.rate_limit_every
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), FakeTallyHandler)
+    print(f"[@] API do Tally simulada em http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
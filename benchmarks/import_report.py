@@ -0,0 +1,93 @@
+"""
+Relatório de tempo de import e RSS do processo web e do worker.
+
+Roda o import em um subprocesso com `python -X importtime`, lista os módulos
+com maior tempo cumulativo e o RSS máximo ao final. No modo web, falha
+(exit 1) se algum módulo exclusivo do worker for importado.
+
+Uso:
+    python -m benchmarks.import_report            # processo web (create_app)
+    python -m benchmarks.import_report --worker   # worker (app.tasks)
+"""
+
+import argparse
+import subprocess
+import sys
+
+# Módulos que não devem ser carregados pelo processo web
+WORKER_ONLY_MODULES = ("fitz", "pymupdf", "smtplib", "app.tasks")
+
+_WEB_CODE = "from app import create_app; create_app()"
+_WORKER_CODE = "import app.tasks"
+
+_PROBE = """
+import resource, sys
+{code}
+print("RSS_KB", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+print("MODULES", ",".join(sorted(sys.modules)))
+"""
+
+
+def run_probe(code: str) -> tuple[list[tuple[int, int, str]], int, set[str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(code=code)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        imports.append((int(self_us), int(cumulative_us), name.rstrip()))
+
+    rss_kb = 0
+    modules: set[str] = set()
+    for line in result.stdout.splitlines():
+        if line.startswith("RSS_KB "):
+            rss_kb = int(line.split()[1])
+        elif line.startswith("MODULES "):
+            modules = set(line.removeprefix("MODULES ").split(","))
+
+    return imports, rss_kb, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--worker", action="store_true")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    imports, rss_kb, modules = run_probe(_WORKER_CODE if args.worker else _WEB_CODE)
+
+    # Módulos de topo (sem indentação) somam o tempo total
+    total_us = sum(cum for _, cum, name in imports if not name.startswith("  "))
+
+    print(f"{'cumulativo (ms)':>16} {'próprio (ms)':>13}  módulo")
+    for self_us, cumulative_us, name in sorted(imports, key=lambda i: -i[1])[
+        : args.top
+    ]:
+        print(f"{cumulative_us / 1000:>16.1f} {self_us / 1000:>13.1f}  {name.strip()}")
+
+    print(f"\nTempo total de import: {total_us / 1000:.0f} ms")
+    print(f"RSS máximo: {rss_kb / 1024:.1f} MB")
+    print(f"Módulos carregados: {len(modules)}")
+
+    if args.worker:
+        return 0
+
+    leaked = [
+        name
+        for name in WORKER_ONLY_MODULES
+        if name in modules or any(m.startswith(f"{name}.") for m in modules)
+    ]
+    if leaked:
+        print(f"[!] Módulos do worker importados no web: {leaked}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
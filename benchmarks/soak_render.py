@@ -0,0 +1,68 @@
+"""
+Soak test de memória da renderização de relatórios.
+
+Renderiza o mesmo relatório N vezes no mesmo processo (como um filho do
+worker faria ao longo do dia) e amostra o RSS periodicamente. Falha (exit 1)
+se o RSS crescer mais que --max-growth-mb depois do aquecimento, o que indica
+vazamento no caminho PyMuPDF (ex: apply_redactions processando imagens).
+
+Uso:
+    python -m benchmarks.soak_render --renders 10000 --sample-every 500
+"""
+
+import argparse
+import sys
+import time
+
+from app.utils.memory import current_rss_kb
+from app.utils.rendering import build_replacements, render_report
+from app.utils.template_registry import get_template
+from benchmarks.bench_pdf_profiles import sample_response
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--renders", type=int, default=10000)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--sample-every", type=int, default=500)
+    parser.add_argument("--profile", default=None, help="Perfil de saída do PDF")
+    parser.add_argument("--max-growth-mb", type=float, default=20.0)
+    args = parser.parse_args()
+
+    template_bytes = get_template().data
+    replacements = build_replacements(sample_response())
+
+    # Aquecimento: fontes, caches do MuPDF e arenas do malloc
+    for _ in range(args.warmup):
+        render_report(template_bytes, replacements, args.profile)
+
+    baseline_mb = current_rss_kb() / 1024
+    print(f"[@] RSS após aquecimento: {baseline_mb:.1f} MB")
+    print(f"{'renders':>8} {'RSS (MB)':>10} {'delta (MB)':>11} {'ms/render':>10}")
+
+    start = time.perf_counter()
+    for i in range(1, args.renders + 1):
+        render_report(template_bytes, replacements, args.profile)
+        if i % args.sample_every == 0 or i == args.renders:
+            rss_mb = current_rss_kb() / 1024
+            elapsed_ms = (time.perf_counter() - start) * 1000 / i
+            print(
+                f"{i:>8} {rss_mb:>10.1f} {rss_mb - baseline_mb:>11.1f} "
+                f"{elapsed_ms:>10.1f}"
+            )
+
+    growth_mb = current_rss_kb() / 1024 - baseline_mb
+    per_render_kb = growth_mb * 1024 / max(args.renders, 1)
+    if growth_mb > args.max_growth_mb:
+        print(
+            f"[-] RSS cresceu {growth_mb:.1f} MB (~{per_render_kb:.1f} KB/render), "
+            f"acima de {args.max_growth_mb:.0f} MB"
+        )
+        return 1
+
+    print(f"[+] RSS estável: {growth_mb:+.1f} MB (~{per_render_kb:.1f} KB/render)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Script para exportar respostas do formulário (scores e status) em CSV ou Parquet"""
+
+import argparse
+import sys
+
+from app.utils.export import (
+    EXPORT_FORMATS,
+    ExportFilters,
+    iter_response_chunks,
+    require_pyarrow,
+    stream_csv,
+    stream_parquet,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument(
+        "--output", "-o", default="-", help="Arquivo de saída (padrão: stdout)"
+    )
+    parser.add_argument("--form-id", help="Filtrar por formulário/coorte")
+    parser.add_argument("--from", dest="from_", help="created_at inicial (ISO 8601)")
+    parser.add_argument("--to", help="created_at final, exclusivo (ISO 8601)")
+    parser.add_argument("--processed", help="Filtrar por processed (true/false)")
+    parser.add_argument("--email-sent", help="Filtrar por email_sent (true/false)")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    try:
+        filters = ExportFilters.from_params(
+            {
+                "form_id": args.form_id,
+                "from": args.from_,
+                "to": args.to,
+                "processed": args.processed,
+                "email_sent": args.email_sent,
+            }
+        )
+    except ValueError as e:
+        sys.exit(f"[-] {e}")
+    chunks = iter_response_chunks(filters, args.chunk_size)
+
+    if args.format == "parquet":
+        # Antes de abrir (e truncar) o arquivo de saída
+        try:
+            require_pyarrow()
+        except RuntimeError as e:
+            sys.exit(f"[-] {e}")
+        if args.output == "-":
+            out = sys.stdout.buffer
+        else:
+            out = open(args.output, "wb")
+        with out:
+            for data in stream_parquet(chunks):
+                out.write(data)
+    else:
+        if args.output == "-":
+            out = sys.stdout
+        else:
+            out = open(args.output, "w", newline="", encoding="utf-8")
+        with out:
+            for text in stream_csv(chunks):
+                out.write(text)
+
+
+if __name__ == "__main__":
+    main()
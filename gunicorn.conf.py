@@ -0,0 +1,55 @@
+"""
+Perfil de produção do gunicorn (carregado com `gunicorn -c gunicorn.conf.py`).
+
+Todos os valores podem ser sobrescritos por variáveis de ambiente GUNICORN_*.
+Ver benchmarks/bench_server.py para medir requisições/s e RSS por worker.
+"""
+
+import multiprocessing
+import os
+
+wsgi_app = "app:create_app()"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+
+# gthread: o webhook é I/O (banco + broker) e os endpoints de exportação fazem
+# streaming longo; threads evitam que uma resposta lenta segure o worker todo.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+_cpus = multiprocessing.cpu_count()
+if worker_class == "sync":
+    _default_workers = _cpus * 2 + 1
+else:
+    _default_workers = max(2, _cpus)
+workers = int(os.getenv("GUNICORN_WORKERS", "0") or 0) or _default_workers
+
+# Carrega a app no master antes do fork: módulos e objetos importados ficam
+# compartilhados entre os workers (copy-on-write)
+preload_app = True
+
+# Modo de nó único (TASK_EXECUTOR=local): as tasks rodam em threads do worker,
+# então ele precisa ser único e carregar a app depois do fork (threads do
+# master não sobrevivem ao fork)
+if os.getenv("TASK_EXECUTOR") == "local":
+    workers = 1
+    preload_app = False
+
+# Recicla workers periodicamente (com jitter, para não reiniciarem juntos)
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "500"))
+
+# O Tally entrega cada webhook em uma requisição isolada e espera uma resposta
+# rápida (o handler só faz upsert + enfileiramento). Keep-alive curto libera as
+# threads logo; o timeout cobre picos de banco sem matar workers à toa.
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-") or None
+
+
+def post_fork(server, worker):
+    """Descarta as conexões do pool herdadas do master (preload_app)."""
+    from app.utils.database import engine
+
+    engine.dispose(close=False)
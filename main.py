@@ -1,4 +1,5 @@
 from app import create_app
+from app.config import Config
 from app.utils.database import create_db_and_tables
 
 app = create_app()
@@ -8,7 +9,8 @@ def main():
     """Função principal para executar a aplicação"""
     # Criar tabelas antes de iniciar (necessário para desenvolvimento local)
     create_db_and_tables()
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    # Servidor de desenvolvimento; em produção use `gunicorn -c gunicorn.conf.py`
+    app.run(host="0.0.0.0", port=5000, debug=Config.FLASK_DEBUG)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Relay do outbox de tasks: publica no broker o que o webhook gravou no banco"""
+
+import argparse
+
+from app.config import Config
+from app.utils.log import configure_logging
+from app.utils.outbox import run_relay
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=Config.OUTBOX_BATCH_SIZE)
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=Config.OUTBOX_POLL_INTERVAL_SECONDS,
+        help="Espera máxima entre varreduras (segundos)",
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="Esvazia o outbox uma vez e sai"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    configure_logging()
+    print(f"[@] Relay do outbox (lotes de {args.batch_size})")
+    run_relay(args.batch_size, args.poll_interval, once=args.once)
+    if args.once:
+        print("[+] Outbox vazio")
+
+
+if __name__ == "__main__":
+    main()
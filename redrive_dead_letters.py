@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Script para reenfileirar em massa tasks da tabela de dead letters"""
+
+import argparse
+from datetime import datetime
+
+from sqlmodel import Session, select, update
+
+from app.celery_app import BULK_QUEUE, LANES
+from app.models.dead_letter import DeadLetter
+from app.models.form_response import FormResponse
+from app.utils.database import engine
+from app.utils.dispatch import enqueue_form_response
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stage", choices=("scoring", "pdf", "email"))
+    parser.add_argument("--kind", choices=("permanent", "exhausted"))
+    parser.add_argument("--exception", help="Tipo da exceção (ex: SMTPDataError)")
+    parser.add_argument(
+        "--since", type=datetime.fromisoformat, help="Criados a partir de (ISO)"
+    )
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--lane", choices=LANES, default=BULK_QUEUE)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Só lista, sem reenfileirar"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    statement = select(DeadLetter).where(DeadLetter.redriven_at.is_(None))  # type: ignore
+    if args.stage:
+        statement = statement.where(DeadLetter.stage == args.stage)
+    if args.kind:
+        statement = statement.where(DeadLetter.kind == args.kind)
+    if args.exception:
+        statement = statement.where(DeadLetter.exception_type == args.exception)
+    if args.since:
+        statement = statement.where(DeadLetter.created_at >= args.since)
+    statement = statement.order_by(DeadLetter.id).limit(args.limit)  # type: ignore
+
+    with Session(engine) as session:
+        dead_letters = session.exec(statement).all()
+
+        for dl in dead_letters:
+            print(
+                f"  [{dl.id}] response={dl.response_id} {dl.stage}/{dl.kind} "
+                f"{dl.exception_type} ({dl.attempts} tentativas): {dl.error_message[:80]}"
+            )
+
+        if args.dry_run or not dead_letters:
+            print(f"[@] {len(dead_letters)} dead letters encontrados")
+            return
+
+        letter_ids = [dl.id for dl in dead_letters]
+        # Uma resposta pode ter vários dead letters; reenfileira uma vez só
+        response_ids = list(dict.fromkeys(dl.response_id for dl in dead_letters))
+
+        # Limpa o erro para o sweeper voltar a enxergar a submissão
+        session.exec(
+            update(FormResponse)
+            .where(FormResponse.id.in_(response_ids))  # type: ignore
+            .values(error_message=None, updated_at=datetime.utcnow())
+        )
+        session.exec(
+            update(DeadLetter)
+            .where(DeadLetter.id.in_(letter_ids))  # type: ignore
+            .values(redriven_at=datetime.utcnow())
+        )
+        session.commit()
+
+    for response_id in response_ids:
+        enqueue_form_response(response_id, lane=args.lane)
+
+    print(
+        f"[+] {len(response_ids)} respostas reenfileiradas na fila {args.lane} "
+        f"({len(letter_ids)} dead letters)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Script para regerar em lote os relatórios PDF (reenvios e backfills)"""
+
+import argparse
+import sys
+import time
+
+from app.celery_app import BULK_QUEUE, LANES
+from app.tasks.batch_render import render_reports_batch
+from app.utils.batch_render import (
+    iter_render_jobs,
+    iter_rendered_reports,
+    load_render_jobs,
+    stream_zip,
+    write_reports,
+)
+from app.utils.export import ExportFilters
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "ids",
+        nargs="*",
+        type=int,
+        help="IDs dos FormResponse (lidos do stdin, um por linha, se omitidos)",
+    )
+    destination = parser.add_mutually_exclusive_group(required=True)
+    destination.add_argument("--output-dir", help="Diretório de destino dos PDFs")
+    destination.add_argument(
+        "--archive", help="Arquivo ZIP de destino ('-' para stdout, em streaming)"
+    )
+
+    selection = parser.add_argument_group(
+        "filtros", "Selecionam as respostas no banco em vez de receber IDs"
+    )
+    selection.add_argument("--form-id", help="Formulário/coorte")
+    selection.add_argument("--from", dest="from_", help="created_at inicial (ISO 8601)")
+    selection.add_argument("--to", help="created_at final, exclusivo (ISO 8601)")
+    selection.add_argument("--processed", help="Filtrar por processed (true/false)")
+    selection.add_argument("--email-sent", help="Filtrar por email_sent (true/false)")
+
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Enfileira no Celery em vez de renderizar localmente",
+    )
+    parser.add_argument(
+        "--lane",
+        choices=LANES,
+        default=BULK_QUEUE,
+        help="Fila usada com --enqueue (padrão: bulk)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.enqueue and args.archive == "-":
+        # No worker, "-" viraria um arquivo com esse nome
+        sys.exit("[-] --archive - (stdout) não combina com --enqueue")
+
+    filters = ExportFilters.from_params(
+        {
+            "form_id": args.form_id,
+            "from": args.from_,
+            "to": args.to,
+            "processed": args.processed,
+            "email_sent": args.email_sent,
+        }
+    )
+
+    start = time.perf_counter()
+    if filters != ExportFilters():
+        if args.ids or args.enqueue:
+            sys.exit("[-] Filtros não combinam com IDs nem com --enqueue")
+        # Seleção por filtro: jobs em blocos, memória constante
+        jobs = iter_render_jobs(filters)
+    else:
+        ids = args.ids or [int(line) for line in sys.stdin if line.strip()]
+        if args.enqueue:
+            render_reports_batch.apply_async(  # type: ignore
+                (ids, args.output_dir, args.archive), queue=args.lane
+            )
+            print(f"[+] Lote com {len(ids)} relatórios enfileirado na fila {args.lane}")
+            return
+        jobs = load_render_jobs(ids)
+
+    rendered = iter_rendered_reports(jobs, max_workers=args.workers)
+    if args.archive == "-":
+        # ZIP em streaming para stdout (ex: | aws s3 cp - s3://...)
+        archive = stream_zip(rendered)
+        for data in archive:
+            sys.stdout.buffer.write(data)
+        count = archive.count
+    else:
+        count = write_reports(
+            rendered, output_dir=args.output_dir, archive_path=args.archive
+        )
+
+    elapsed = time.perf_counter() - start
+    print(f"[+] {count} relatórios gerados em {elapsed:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
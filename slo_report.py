@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Relatório de latência por etapa (p50/p95/p99 por dia) e checagem de SLO"""
+
+import argparse
+import math
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import Integer, cast, func
+from sqlmodel import Session, select
+
+from app.models.form_response import FormResponse
+from app.utils.database import engine
+
+# (nome, início, fim) de cada trecho da trilha de latência
+SEGMENTS = (
+    ("enfileirar", FormResponse.received_at, FormResponse.enqueued_at),
+    ("fila", FormResponse.enqueued_at, FormResponse.scoring_started_at),
+    ("scores", FormResponse.scoring_started_at, FormResponse.scoring_finished_at),
+    ("pdf", FormResponse.scoring_finished_at, FormResponse.pdf_finished_at),
+    ("email", FormResponse.pdf_finished_at, FormResponse.email_accepted_at),
+    ("total", FormResponse.received_at, FormResponse.email_accepted_at),
+)
+PERCENTILES = (0.5, 0.95, 0.99)
+
+# Colunas de horário usadas pelos trechos, sem repetição
+TIMESTAMPS = tuple(
+    dict.fromkeys(column for _, start, end in SEGMENTS for column in (start, end))
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=7, help="Janela em dias")
+    parser.add_argument(
+        "--slo-seconds",
+        type=float,
+        default=120.0,
+        help="Tempo máximo entre o webhook e o email aceito pelo SMTP",
+    )
+    parser.add_argument(
+        "--slo-target",
+        type=float,
+        default=0.95,
+        help="Fração mínima de submissões dentro do SLO",
+    )
+    return parser.parse_args()
+
+
+def build_statement(since: datetime, until: datetime, slo_seconds: float):
+    """
+    Agrega os percentis de cada trecho por dia (percentile_cont, PostgreSQL).
+
+    A última linha (dia NULL, via ROLLUP) traz o total da janela. Submissões
+    que não chegaram ao email contam como fora do SLO.
+    """
+    day = func.date_trunc("day", FormResponse.received_at)
+    total_seconds = func.extract(
+        "epoch", FormResponse.email_accepted_at - FormResponse.received_at
+    )
+
+    columns = [
+        day.label("day"),
+        func.count().label("received"),
+        func.count(FormResponse.email_accepted_at).label("delivered"),
+        func.sum(cast(total_seconds <= slo_seconds, Integer)).label("within_slo"),
+    ]
+    for name, start, end in SEGMENTS:
+        seconds = func.extract("epoch", end - start)
+        for p in PERCENTILES:
+            columns.append(
+                func.percentile_cont(p)
+                .within_group(seconds)
+                .label(f"{name}_p{round(p * 100)}")
+            )
+
+    return (
+        select(*columns)
+        .where(FormResponse.received_at >= since)
+        .where(FormResponse.received_at < until)
+        .group_by(func.rollup(day))
+        .order_by(day.nulls_last())
+    )
+
+
+def percentile_cont(values: list[float], p: float) -> Optional[float]:
+    """Percentil com interpolação linear, como o percentile_cont do PostgreSQL."""
+    if not values:
+        return None
+    position = p * (len(values) - 1)
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def aggregate_in_python(
+    session: Session, since: datetime, until: datetime, slo_seconds: float
+) -> list[dict[str, Any]]:
+    """
+    Mesmas linhas de build_statement, calculadas em Python (SQLite).
+
+    Lê só as colunas de horário da janela e guarda as durações por dia; a
+    última linha (dia None) traz o total da janela.
+    """
+    statement = (
+        select(*TIMESTAMPS)
+        .where(FormResponse.received_at >= since)
+        .where(FormResponse.received_at < until)
+    )
+
+    days: dict[Optional[datetime], dict[str, Any]] = defaultdict(
+        lambda: {
+            "received": 0,
+            "delivered": 0,
+            "within_slo": 0,
+            "seconds": {name: [] for name, _, _ in SEGMENTS},
+        }
+    )
+    for row in session.exec(statement):
+        stamps = {column.key: value for column, value in zip(TIMESTAMPS, row)}
+        day = stamps["received_at"].replace(hour=0, minute=0, second=0, microsecond=0)
+        for group in (days[day], days[None]):
+            group["received"] += 1
+            if stamps["email_accepted_at"] is not None:
+                group["delivered"] += 1
+            for name, start, end in SEGMENTS:
+                if stamps[start.key] is None or stamps[end.key] is None:
+                    continue
+                seconds = (stamps[end.key] - stamps[start.key]).total_seconds()
+                group["seconds"][name].append(seconds)
+                if name == "total" and seconds <= slo_seconds:
+                    group["within_slo"] += 1
+
+    rows = []
+    for day in sorted(days, key=lambda d: (d is None, d)):
+        group = days[day]
+        row = {
+            "day": day,
+            "received": group["received"],
+            "delivered": group["delivered"],
+            "within_slo": group["within_slo"],
+        }
+        for name, values in group["seconds"].items():
+            values.sort()
+            for p in PERCENTILES:
+                row[f"{name}_p{round(p * 100)}"] = percentile_cont(values, p)
+        rows.append(row)
+    return rows
+
+
+def _fmt(seconds) -> str:
+    return "-" if seconds is None else f"{seconds:.1f}"
+
+
+def main() -> int:
+    args = parse_args()
+
+    # Submissões mais recentes que o SLO ainda podem estar em andamento
+    until = datetime.utcnow() - timedelta(seconds=args.slo_seconds)
+    since = until - timedelta(days=args.days)
+
+    with Session(engine) as session:
+        if engine.dialect.name == "postgresql":
+            statement = build_statement(since, until, args.slo_seconds)
+            rows = [dict(row._mapping) for row in session.exec(statement)]
+        else:
+            # Sem percentile_cont (ex: SQLite no modo de nó único)
+            rows = aggregate_in_python(session, since, until, args.slo_seconds)
+
+    if not rows:
+        print("[@] Nenhuma submissão na janela")
+        return 0
+
+    header = ["dia", "recebidas", "entregues", "no SLO"]
+    for name, _, _ in SEGMENTS:
+        header += [f"{name} p{round(p * 100)}" for p in PERCENTILES]
+    print("\t".join(header))
+
+    for row in rows:
+        line = [
+            row["day"].date().isoformat() if row["day"] else "TOTAL",
+            str(row["received"]),
+            str(row["delivered"]),
+            str(row["within_slo"] or 0),
+        ]
+        for name, _, _ in SEGMENTS:
+            line += [_fmt(row[f"{name}_p{round(p * 100)}"]) for p in PERCENTILES]
+        print("\t".join(line))
+
+    total = rows[-1]
+    compliance = (total["within_slo"] or 0) / total["received"]
+    print(
+        f"\n[@] {compliance:.2%} das submissões entregues em até "
+        f"{args.slo_seconds:.0f}s (meta: {args.slo_target:.2%})"
+    )
+
+    if compliance < args.slo_target:
+        print("[-] SLO violado")
+        return 1
+
+    print("[+] SLO cumprido")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())